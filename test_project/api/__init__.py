@@ -0,0 +1,4 @@
+# Этот файл делает директорию api Python пакетом
+from .client import KinopoiskApiClient
+
+__all__ = ['KinopoiskApiClient']
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+import allure
+import requests
+from .stats import format_histogram, summarize
+
+
+# Метрики, по которым сравнивается текущий прогон с базовой линией
+COMPARED_METRICS = ("p50", "p95")
+
+
+class LatencyResult:
+    """Результат замера сценария: последний ответ и сводка задержек"""
+
+    def __init__(self, scenario: str, response: requests.Response,
+                 samples: List[float]) -> None:
+        self.scenario = scenario
+        self.response = response
+        self.samples = samples
+        self.stats = summarize(samples)
+
+
+class ApiBenchmark:
+    """
+    Замер задержек сценариев API
+
+    В обычном режиме сценарий выполняется один раз. В режиме бенчмарка
+    после прогрева сценарий повторяется rounds раз, сводка (p50/p95/p99,
+    max, гистограмма) прикладывается к Allure и сравнивается с базовой
+    линией; рост метрик сверх tolerance считается регрессией.
+    """
+
+    def __init__(self, enabled: bool = False, rounds: int = 30, warmup: int = 3,
+                 baseline_path: Optional[str] = None, tolerance: float = 0.2) -> None:
+        """
+        Args:
+            enabled: Включен ли режим бенчмарка
+            rounds: Число замеряемых повторов
+            warmup: Число прогревочных повторов (не учитываются)
+            baseline_path: JSON файл с базовой линией
+            tolerance: Допустимый рост метрик относительно базовой линии (0.2 = 20%)
+        """
+        self.enabled = enabled
+        self.rounds = rounds
+        self.warmup = warmup
+        self.baseline_path = baseline_path
+        self.tolerance = tolerance
+        self.baseline = self._read_baseline()
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def _read_baseline(self) -> Dict[str, Dict[str, float]]:
+        if not self.baseline_path:
+            return {}
+        try:
+            with open(self.baseline_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def measure(self, scenario: str,
+                send: Callable[[], requests.Response]) -> LatencyResult:
+        """
+        Выполнить сценарий и замерить задержку
+
+        Args:
+            scenario: Имя сценария (ключ в базовой линии)
+            send: Функция, отправляющая запрос сценария
+
+        Returns:
+            LatencyResult с последним ответом и сводкой задержек
+        """
+        if not self.enabled:
+            response = send()
+            return LatencyResult(scenario, response, [response.elapsed.total_seconds()])
+
+        with allure.step(f"Бенчмарк '{scenario}': прогрев {self.warmup}, "
+                         f"замеров {self.rounds}"):
+            for _ in range(self.warmup):
+                send()
+            samples = []
+            response = None
+            for _ in range(self.rounds):
+                response = send()
+                samples.append(response.elapsed.total_seconds())
+            result = LatencyResult(scenario, response, samples)
+            self.results[scenario] = result.stats
+            self._report(result)
+        return result
+
+    def _report(self, result: LatencyResult) -> None:
+        stats = result.stats
+        allure.attach(json.dumps(stats, indent=2), name=f"{result.scenario}: задержки",
+                      attachment_type=allure.attachment_type.JSON)
+        allure.attach(format_histogram(result.samples),
+                      name=f"{result.scenario}: гистограмма",
+                      attachment_type=allure.attachment_type.TEXT)
+        print(f"⏱ {result.scenario}: p50={stats['p50'] * 1000:.1f} мс, "
+              f"p95={stats['p95'] * 1000:.1f} мс, p99={stats['p99'] * 1000:.1f} мс, "
+              f"max={stats['max'] * 1000:.1f} мс")
+
+    def regressions(self, result: LatencyResult) -> List[str]:
+        """Список метрик, превысивших базовую линию больше чем на tolerance"""
+        baseline = self.baseline.get(result.scenario)
+        if not self.enabled or not baseline:
+            return []
+        problems = []
+        for metric in COMPARED_METRICS:
+            limit = baseline[metric] * (1 + self.tolerance)
+            if result.stats[metric] > limit:
+                problems.append(
+                    f"{metric}: {result.stats[metric] * 1000:.1f} мс > "
+                    f"{limit * 1000:.1f} мс (база {baseline[metric] * 1000:.1f} мс "
+                    f"+ {self.tolerance:.0%})")
+        return problems
+
+    def assert_no_regression(self, result: LatencyResult) -> None:
+        """Упасть, если задержки сценария хуже базовой линии"""
+        problems = self.regressions(result)
+        assert not problems, (f"Регрессия задержки '{result.scenario}': "
+                              + "; ".join(problems))
+
+    def save_baseline(self) -> None:
+        """Записать результаты прогона в файл базовой линии"""
+        if not self.results or not self.baseline_path:
+            return
+        data = self._read_baseline()
+        for scenario, stats in self.results.items():
+            data[scenario] = dict(stats, recorded_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+
+        directory = os.path.dirname(self.baseline_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.baseline_path)
+        print(f"💾 Базовая линия задержек сохранена: {self.baseline_path}")
@@ -0,0 +1,277 @@
+"""
+Массовая проверка поиска по корпусу названий
+
+Названия читаются потоком из CSV или JSONL (колонки title и
+необязательная film_id) и отправляются в search-by-keyword через
+PaginatedCrawler.fetch (общий token bucket, 429 и повторы 5xx).
+Результаты пишутся в JSONL в порядке корпуса сразу по мере готовности.
+В работе одновременно не больше window названий: если запись ждет
+медленный запрос, чтение корпуса тоже ждет, поэтому память не зависит
+от размера корпуса.
+
+Прерванный запуск продолжается с места остановки: строк в файле
+результатов ровно столько, сколько названий корпуса уже проверено.
+Если прошлый запуск дошел до конца корпуса (или limit), проверка
+начинается заново.
+
+    python -m api.bulk_search search_corpus.csv --output reports/bulk_search.jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Any, Dict, Iterator, List, Optional
+import requests
+from dotenv import load_dotenv
+from .client import KinopoiskApiClient
+from .crawler import PaginatedCrawler
+
+
+SEARCH_PATH = "/api/v2.1/films/search-by-keyword"
+
+# Сколько примеров ошибок хранить в отчете
+FAILURE_EXAMPLES = 20
+
+
+def read_corpus(path: str) -> Iterator[Dict[str, Any]]:
+    """Названия корпуса по одному: {'title': str, 'film_id': int или None}"""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            film_id = row.get("film_id")
+            yield {"title": row["title"].strip(),
+                   "film_id": int(film_id) if film_id not in (None, "") else None}
+
+
+def normalize_title(title: str) -> str:
+    """Название для сравнения: без регистра и знаков препинания, ё -> е"""
+    return " ".join(re.findall(r"\w+", title.casefold().replace("ё", "е")))
+
+
+def check_entry(entry: Dict[str, Any], films: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Сравнить первую страницу поиска с ожидаемым фильмом
+
+    С film_id фильм ищется среди результатов по filmId, без него
+    проверяется первый результат. Статусы: ok, wrong_name (фильм найден,
+    название не совпадает), not_found.
+    """
+    result = {"title": entry["title"], "film_id": entry["film_id"], "found": len(films)}
+    position = None
+    if entry["film_id"] is None:
+        position = 0 if films else None
+    else:
+        ids = [film.get("filmId") for film in films]
+        if entry["film_id"] in ids:
+            position = ids.index(entry["film_id"])
+    if position is None:
+        result["status"] = "not_found"
+        return result
+
+    film = films[position]
+    names = {normalize_title(film.get(key) or "") for key in ("nameRu", "nameEn")}
+    result.update(position=position, found_id=film.get("filmId"),
+                  found_name=film.get("nameRu") or film.get("nameEn"),
+                  status="ok" if normalize_title(entry["title"]) in names else "wrong_name")
+    return result
+
+
+def prepare_output(path: str, resume: bool = True) -> int:
+    """
+    Подготовить файл результатов
+
+    Недописанная последняя строка (запуск прервался во время записи)
+    отрезается.
+
+    Returns:
+        Сколько названий корпуса уже проверено
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if not resume or not os.path.exists(path):
+        open(path, "w").close()
+        return 0
+
+    lines, complete_end, offset = 0, 0, 0
+    with open(path, "rb+") as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            last_newline = chunk.rfind(b"\n")
+            if last_newline >= 0:
+                complete_end = offset + last_newline + 1
+            offset += len(chunk)
+        if complete_end < offset:
+            f.truncate(complete_end)
+    return lines
+
+
+class BulkSearchReport:
+    """Итоги проверки, собранные потоком по файлу результатов"""
+
+    def __init__(self) -> None:
+        self.statuses: Counter = Counter()
+        self.top1 = 0
+        self.failures: List[Dict[str, Any]] = []
+        self.checked = 0
+        self.resumed = 0
+        self.seconds = 0.0
+
+    @classmethod
+    def from_file(cls, path: str) -> "BulkSearchReport":
+        report = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                report.add(json.loads(line))
+        return report
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.statuses[result["status"]] += 1
+        if result["status"] == "ok" and result.get("position") == 0:
+            self.top1 += 1
+        if result["status"] != "ok" and len(self.failures) < FAILURE_EXAMPLES:
+            self.failures.append(result)
+
+    @property
+    def total(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def accuracy(self) -> float:
+        """Доля названий, для которых найден ожидаемый фильм с верным названием"""
+        return self.statuses["ok"] / self.total if self.total else 0.0
+
+    def summary(self) -> str:
+        speed = self.checked / self.seconds if self.seconds else 0.0
+        statuses = ", ".join(f"{name}: {count}" for name, count in sorted(self.statuses.items()))
+        return (f"{self.total} названий ({statuses}), точность {self.accuracy:.1%}, "
+                f"первым результатом {self.top1}; в этом запуске {self.checked} "
+                f"за {self.seconds:.1f} с ({speed:.1f}/с), продолжено с {self.resumed}")
+
+
+class BulkSearch:
+    """Потоковая проверка поиска по корпусу с ограниченной параллельностью"""
+
+    def __init__(self, crawler: PaginatedCrawler, window: Optional[int] = None) -> None:
+        """
+        Args:
+            crawler: Обходчик API (параллельность, частота запросов, повторы)
+            window: Максимум названий в работе (по умолчанию 4 * concurrency)
+        """
+        self.crawler = crawler
+        self.window = window or crawler.concurrency * 4
+
+    def search(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            data = self.crawler.fetch(SEARCH_PATH, {"keyword": entry["title"]})
+        except (requests.RequestException, ValueError) as e:
+            return {"title": entry["title"], "film_id": entry["film_id"],
+                    "status": "error", "error": f"{type(e).__name__}: {e}"[:200]}
+        return check_entry(entry, data.get("films") or [])
+
+    def run(self, corpus_path: str, output_path: str, resume: bool = True,
+            limit: Optional[int] = None, progress_every: int = 1000) -> BulkSearchReport:
+        """
+        Проверить корпус и дописать результаты в JSONL
+
+        Args:
+            corpus_path: CSV или JSONL с колонками title и film_id
+            output_path: Файл результатов (одна строка на название корпуса)
+            resume: Продолжить прерванный запуск (False - начать заново)
+            limit: Проверить только первые limit названий корпуса
+            progress_every: Печатать прогресс каждые N названий (0 - не печатать)
+
+        Returns:
+            Итоги по всему файлу результатов, включая прошлые запуски
+        """
+        started = time.perf_counter()
+        done = prepare_output(output_path, resume)
+        entries = islice(read_corpus(corpus_path), done, limit)
+        first = next(entries, None)
+        if first is None and done:
+            # Прошлый запуск завершен - проверяем корпус заново
+            done = prepare_output(output_path, resume=False)
+            entries = islice(read_corpus(corpus_path), limit)
+        elif first is not None:
+            entries = chain([first], entries)
+        checked = 0
+
+        with open(output_path, "a", encoding="utf-8") as output, \
+                ThreadPoolExecutor(max_workers=self.crawler.concurrency) as executor:
+            pending = deque()
+
+            def write_oldest() -> None:
+                nonlocal checked
+                result = pending.popleft().result()
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                checked += 1
+                if progress_every and checked % progress_every == 0:
+                    print(f"🔎 Проверено {done + checked} названий "
+                          f"({checked / (time.perf_counter() - started):.1f}/с)")
+
+            for entry in entries:
+                pending.append(executor.submit(self.search, entry))
+                if len(pending) >= self.window:
+                    write_oldest()
+            while pending:
+                write_oldest()
+
+        report = BulkSearchReport.from_file(output_path)
+        report.checked = checked
+        report.resumed = done
+        report.seconds = time.perf_counter() - started
+        return report
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Массовая проверка поиска по корпусу названий")
+    parser.add_argument("corpus", help="CSV или JSONL с колонками title и film_id")
+    parser.add_argument("--output", default="bulk_search.jsonl",
+                        help="JSONL файл результатов")
+    parser.add_argument("--base-url", default=os.getenv("API_BASE_URL"))
+    parser.add_argument("--api-key", default=os.getenv("API_KEY"))
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--rate", type=float, default=10, help="Запросов в секунду")
+    parser.add_argument("--window", type=int, help="Максимум названий в работе")
+    parser.add_argument("--limit", type=int, help="Проверить только первые N названий")
+    parser.add_argument("--restart", action="store_true",
+                        help="Начать заново, а не продолжать прерванный запуск")
+    args = parser.parse_args()
+
+    client = KinopoiskApiClient(
+        args.base_url,
+        headers={"X-API-KEY": args.api_key, "Content-Type": "application/json"},
+        pool_size=args.concurrency)
+    crawler = PaginatedCrawler(client, concurrency=args.concurrency, rate=args.rate)
+
+    print(f"🚀 Проверка поиска по корпусу {args.corpus} на {args.base_url}")
+    try:
+        report = BulkSearch(crawler, args.window).run(
+            args.corpus, args.output, resume=not args.restart, limit=args.limit)
+    except KeyboardInterrupt:
+        print(f"⏸️ Прервано, результаты сохранены в {args.output} "
+              f"(повторный запуск продолжит с места остановки)")
+        return
+    finally:
+        client.close()
+
+    print(report.summary())
+    for failure in report.failures:
+        print(f"  ❌ {failure}")
+    print(f"💾 Результаты: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import timedelta
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from .client import NetworkAdapter
+
+
+API_MODES = ("live", "record", "replay")
+
+# Заголовки, которые теряют смысл после того, как requests распаковал тело
+SKIPPED_HEADERS = ("content-encoding", "transfer-encoding", "content-length",
+                   "connection", "keep-alive")
+
+
+class CassetteMissError(requests.ConnectionError):
+    """В режиме replay для запроса нет сохраненного ответа"""
+
+
+def cassette_key(request: requests.PreparedRequest) -> dict:
+    """
+    Ключ записи: метод, URL без query, отсортированные параметры
+    и признак наличия API-ключа (само значение ключа не сохраняется)
+    """
+    parts = urlsplit(request.url)
+    return {
+        "method": request.method,
+        "url": urlunsplit((parts.scheme, parts.netloc, parts.path, "", "")),
+        "params": sorted(parse_qsl(parts.query, keep_blank_values=True)),
+        "api_key": bool(request.headers.get("X-API-KEY")),
+    }
+
+
+def cassette_path(directory: str, key: dict) -> str:
+    """Путь к файлу записи: читаемый префикс и хэш ключа"""
+    digest = hashlib.sha1(
+        json.dumps(key, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+    slug = re.sub(r"[^0-9A-Za-z.]+", "_", urlsplit(key["url"]).path).strip("_")
+    return os.path.join(directory, f"{key['method']}_{slug}_{digest[:12]}.json")
+
+
+def restore_recorded_elapsed(response: requests.Response, **kwargs) -> requests.Response:
+    """
+    Хук сессии: вернуть записанное время ответа
+
+    requests перезаписывает response.elapsed после adapter.send,
+    поэтому записанное значение восстанавливается в response-хуке.
+    """
+    recorded = getattr(response, "recorded_elapsed", None)
+    if recorded is not None:
+        response.elapsed = timedelta(seconds=recorded)
+    return response
+
+
+class CassetteAdapter(NetworkAdapter):
+    """
+    Транспорт requests с записью и воспроизведением ответов API
+
+    record - запросы идут в сеть, ответы сохраняются на диск;
+    replay - ответы отдаются с диска без обращения к сети.
+    Сохраняются статус, заголовки, тело и время ответа, поэтому
+    негативные сценарии (401, 400) воспроизводятся так же, как вживую.
+    """
+
+    def __init__(self, directory: str, mode: str, **kwargs) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Неизвестный режим кассет: {mode}")
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.mode = mode
+
+    def send(self, request, **kwargs):
+        key = cassette_key(request)
+        path = cassette_path(self.directory, key)
+
+        if self.mode == "replay":
+            return self._load(request, path)
+
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        # Session выставит elapsed только после send, поэтому замеряем здесь
+        elapsed = time.perf_counter() - started
+        self._save(path, key, response, elapsed)
+        return response
+
+    def _save(self, path: str, key: dict, response: requests.Response,
+              elapsed: float) -> None:
+        """Сохранить ответ на диск"""
+        content = response.content
+        try:
+            body, encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+
+        record = {
+            "request": key,
+            "response": {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": {name: value for name, value in response.headers.items()
+                            if name.lower() not in SKIPPED_HEADERS},
+                "body": body,
+                "body_encoding": encoding,
+                "elapsed": elapsed,
+            },
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+
+    def _load(self, request, path: str) -> requests.Response:
+        """Собрать Response из сохраненной записи"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)["response"]
+        except FileNotFoundError:
+            raise CassetteMissError(
+                f"Нет записи для {request.method} {request.url} ({path}). "
+                f"Запустите тесты с --api-mode=record", request=request)
+
+        if record["body_encoding"] == "base64":
+            content = base64.b64decode(record["body"])
+        else:
+            content = record["body"].encode("utf-8")
+
+        response = requests.Response()
+        response.status_code = record["status_code"]
+        response.reason = record["reason"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = content
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.recorded_elapsed = record["elapsed"]
+        return response
+
+
+def use_cassette(client, directory: str, mode: str) -> None:
+    """
+    Переключить клиент API на запись или воспроизведение ответов
+
+    Args:
+        client: KinopoiskApiClient
+        directory: Каталог с записями
+        mode: 'record' или 'replay' ('live' оставляет клиент без изменений)
+    """
+    if mode == "live":
+        return
+    client.mount(CassetteAdapter(directory, mode, pool_connections=client.pool_size,
+                                 pool_maxsize=client.pool_size))
+    client.session.hooks["response"].append(restore_recorded_elapsed)
@@ -0,0 +1,119 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+import allure
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Ожидание перед запросом в сеть для текущего потока (см. network_gate)
+_network_gate = threading.local()
+
+
+@contextmanager
+def network_gate(acquire: Callable[[], None]) -> Iterator[None]:
+    """
+    Вызывать acquire перед каждым запросом потока, который уходит в сеть
+
+    Ответы, которые транспорт отдает без сети (воспроизведение кассет,
+    свежие записи дискового кэша), acquire не вызывают, поэтому
+    ограничение частоты тратится только на настоящие запросы.
+    """
+    previous = getattr(_network_gate, "acquire", None)
+    _network_gate.acquire = acquire
+    try:
+        yield
+    finally:
+        _network_gate.acquire = previous
+
+
+class NetworkAdapter(HTTPAdapter):
+    """Транспорт requests, который перед отправкой в сеть проходит network_gate"""
+
+    def send(self, request, **kwargs):
+        acquire = getattr(_network_gate, "acquire", None)
+        if acquire is not None:
+            acquire()
+        return super().send(request, **kwargs)
+
+
+class KinopoiskApiClient:
+    """
+    Клиент API Кинопоиска
+
+    Все запросы идут через один requests.Session с пулом keep-alive
+    соединений, поэтому TCP+TLS рукопожатие выполняется один раз,
+    а повторные запросы переиспользуют соединения.
+    """
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+                 pool_size: int = 10, timeout: float = 30) -> None:
+        """
+        Args:
+            base_url: Базовый URL API
+            headers: Заголовки по умолчанию (в том числе X-API-KEY)
+            pool_size: Размер пула соединений к одному хосту
+            timeout: Таймаут запроса в секундах
+        """
+        self.base_url = (base_url or "").rstrip("/")
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self.mount(NetworkAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+
+    def mount(self, adapter: HTTPAdapter) -> None:
+        """Установить транспорт для http и https"""
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+            authorized: bool = True) -> requests.Response:
+        """
+        Отправить GET запрос к API
+
+        Args:
+            path: Путь относительно базового URL
+            params: Параметры запроса
+            authorized: False - отправить запрос без X-API-KEY
+        """
+        # Значение None удаляет заголовок сессии из конкретного запроса
+        headers = None if authorized else {"X-API-KEY": None}
+        return self.session.get(f"{self.base_url}{path}", params=params,
+                                headers=headers, timeout=self.timeout)
+
+    @allure.step("Поиск фильмов по ключевому слову '{keyword}'")
+    def search_by_keyword(self, keyword: str,
+                          page: Optional[int] = None) -> requests.Response:
+        """GET /api/v2.1/films/search-by-keyword"""
+        params: Dict[str, Any] = {"keyword": keyword}
+        if page is not None:
+            params["page"] = page
+        return self.get("/api/v2.1/films/search-by-keyword", params)
+
+    @allure.step("Поиск фильмов по фильтрам")
+    def get_films(self, **filters: Any) -> requests.Response:
+        """GET /api/v2.2/films с фильтрами (countries, genres, order, ...)"""
+        return self.get("/api/v2.2/films", filters)
+
+    @allure.step("Получить топ фильмов {top_type}, страница {page}")
+    def get_top(self, top_type: str = "TOP_250_BEST_FILMS",
+                page: int = 1) -> requests.Response:
+        """GET /api/v2.2/films/top"""
+        return self.get("/api/v2.2/films/top", {"type": top_type, "page": page})
+
+    @allure.step("Получить фильм {film_id}")
+    def get_film(self, film_id: int, authorized: bool = True) -> requests.Response:
+        """GET /api/v2.2/films/{id}"""
+        return self.get(f"/api/v2.2/films/{film_id}", authorized=authorized)
+
+    def warm_up(self) -> None:
+        """Заранее открыть соединение, чтобы рукопожатие не попало в замеры"""
+        try:
+            self.session.head(self.base_url or "/", timeout=self.timeout)
+        except requests.RequestException:
+            pass
+
+    def close(self) -> None:
+        """Закрыть все соединения пула"""
+        self.session.close()
@@ -0,0 +1,219 @@
+"""
+Постраничный обход списков API с ограничением частоты
+
+Страницы после первой загружаются параллельно (не больше concurrency
+одновременно), а общий token bucket держит частоту запросов: на 429
+скорость снижается вдвое и все потоки ждут Retry-After, на успешных
+ответах скорость постепенно возвращается к исходной. Токен тратится
+в транспорте клиента (network_gate) только на запросы, которые уходят
+в сеть: воспроизведенные кассеты и попадания в дисковый кэш не ждут.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import allure
+import requests
+from .client import KinopoiskApiClient, network_gate
+
+
+class AdaptiveTokenBucket:
+    """Token bucket, общий для всех потоков обхода"""
+
+    def __init__(self, rate: float, min_rate: float = 0.5) -> None:
+        """
+        Args:
+            rate: Исходная (и максимальная) частота запросов в секунду
+            min_rate: Ниже этой частоты скорость не снижается
+        """
+        if rate <= 0 or min_rate <= 0:
+            raise ValueError(f"Частота запросов должна быть больше 0: rate={rate}, "
+                             f"min_rate={min_rate}")
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Дождаться токена"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.paused_until:
+                    self.tokens = min(1.0, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+                else:
+                    delay = self.paused_until - now
+            time.sleep(delay)
+
+    def on_success(self) -> None:
+        """Успешный ответ: плавно вернуть скорость (аддитивный рост)"""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def on_throttle(self, retry_after: float) -> None:
+        """Ответ 429: снизить скорость вдвое и приостановить все потоки"""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + retry_after)
+            self.tokens = 0.0
+            self.updated = max(now, self.paused_until)
+
+
+class CrawlResult:
+    """Все элементы списка и статистика обхода"""
+
+    def __init__(self, items: List[Dict[str, Any]], pages: int, requests_sent: int,
+                 throttled: int, seconds: float) -> None:
+        self.items = items
+        self.pages = pages
+        self.requests_sent = requests_sent
+        self.throttled = throttled
+        self.seconds = seconds
+
+    def summary(self) -> str:
+        return (f"{len(self.items)} элементов, {self.pages} страниц, "
+                f"{self.requests_sent} запросов (429: {self.throttled}) "
+                f"за {self.seconds:.2f} с")
+
+
+class PaginatedCrawler:
+    """Параллельный обход всех страниц списка API"""
+
+    def __init__(self, client: KinopoiskApiClient, concurrency: int = 5,
+                 rate: float = 10, max_retries: int = 5) -> None:
+        """
+        Args:
+            client: Клиент API (размер пула не меньше concurrency)
+            concurrency: Максимум одновременных запросов
+            rate: Частота запросов в секунду
+            max_retries: Повторы страницы при 429 и 5xx
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.bucket = AdaptiveTokenBucket(rate)
+        self.max_retries = max_retries
+        self._counters = {"requests": 0, "throttled": 0}
+        self._counters_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._counters_lock:
+            self._counters[name] += 1
+
+    def _acquire(self) -> None:
+        """Запрос уходит в сеть: дождаться токена и учесть запрос"""
+        self.bucket.acquire()
+        self._count("requests")
+
+    def fetch(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Запрос одной страницы с учетом 429/Retry-After и повтором 5xx"""
+        for attempt in range(self.max_retries + 1):
+            with network_gate(self._acquire):
+                response = self.client.get(path, params)
+            if response.status_code == 429:
+                self._count("throttled")
+                self.bucket.on_throttle(_retry_after(response, attempt))
+                continue
+            if response.status_code >= 500 and attempt < self.max_retries:
+                time.sleep(0.1 * 2 ** attempt)
+                continue
+            response.raise_for_status()
+            self.bucket.on_success()
+            return response.json()
+        raise requests.HTTPError(
+            f"{path} {params}: превышено число повторов ({self.max_retries})",
+            response=response)
+
+    def crawl(self, path: str, params: Dict[str, Any], items_key: str,
+              pages_key: str) -> CrawlResult:
+        """
+        Загрузить все страницы списка
+
+        Args:
+            path: Путь списка API
+            params: Параметры запроса без page
+            items_key: Ключ элементов в ответе ('films' или 'items')
+            pages_key: Ключ числа страниц ('pagesCount' или 'totalPages')
+
+        Returns:
+            CrawlResult с элементами в порядке страниц
+        """
+        started = time.perf_counter()
+        self._counters = {"requests": 0, "throttled": 0}
+
+        first = self.fetch(path, dict(params, page=1))
+        pages = max(int(first.get(pages_key) or 1), 1)
+
+        def load(page: int) -> List[Dict[str, Any]]:
+            return self.fetch(path, dict(params, page=page))[items_key]
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            rest = list(executor.map(load, range(2, pages + 1)))
+
+        items = list(first[items_key])
+        for page_items in rest:
+            items.extend(page_items)
+        return CrawlResult(items, pages, self._counters["requests"],
+                           self._counters["throttled"], time.perf_counter() - started)
+
+    @allure.step("Загрузить все страницы топа {top_type}")
+    def crawl_top(self, top_type: str = "TOP_250_BEST_FILMS") -> CrawlResult:
+        """Все страницы /api/v2.2/films/top"""
+        return self.crawl("/api/v2.2/films/top", {"type": top_type}, "films", "pagesCount")
+
+    @allure.step("Загрузить все страницы поиска по фильтрам")
+    def crawl_films(self, **filters: Any) -> CrawlResult:
+        """Все страницы /api/v2.2/films"""
+        return self.crawl("/api/v2.2/films", filters, "items", "totalPages")
+
+
+def _retry_after(response: requests.Response, attempt: int) -> float:
+    """Пауза из Retry-After (секунды) или экспоненциальная"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return 0.5 * 2 ** attempt
+
+
+def _rating(value: Any) -> Optional[float]:
+    """Рейтинг из числа или строки ('8.6'); None - рейтинга нет"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def check_no_duplicates(items: List[Dict[str, Any]], id_key: str) -> None:
+    """В наборе нет повторяющихся фильмов"""
+    seen, duplicates = set(), []
+    for item in items:
+        if item[id_key] in seen:
+            duplicates.append(item[id_key])
+        seen.add(item[id_key])
+    assert not duplicates, f"Повторяющиеся фильмы: {duplicates[:10]}"
+
+
+def check_rating_order(items: List[Dict[str, Any]], rating_key: str) -> None:
+    """Рейтинг не возрастает от начала списка к концу"""
+    ratings = [rating for rating in (_rating(item.get(rating_key)) for item in items)
+               if rating is not None]
+    broken = [index for index in range(1, len(ratings)) if ratings[index] > ratings[index - 1]]
+    assert not broken, (f"Нарушен порядок по рейтингу на позициях {broken[:10]}: "
+                        f"{[ratings[index - 1:index + 1] for index in broken[:3]]}")
+
+
+def check_rating_range(items: List[Dict[str, Any]], rating_key: str, id_key: str,
+                       rating_from: float, rating_to: float) -> None:
+    """Рейтинг всех фильмов внутри [rating_from, rating_to]"""
+    outside = [(item[id_key], item.get(rating_key)) for item in items
+               if _rating(item.get(rating_key)) is not None
+               and not rating_from <= _rating(item.get(rating_key)) <= rating_to]
+    assert not outside, f"Рейтинг вне диапазона {rating_from}-{rating_to}: {outside[:10]}"
@@ -0,0 +1,453 @@
+"""
+Локальный заменитель API Кинопоиска
+
+Повторяет эндпоинты, которые используют API тесты, и семантику ошибок
+реального API (401 без X-API-KEY, 400 для некорректного id), ответы 200
+отдаются с ETag и поддерживают If-None-Match (304). Данные
+генерируются детерминированно, размер набора, задержка и доля ошибок
+настраиваются. Запуск:
+
+    python -m api.fake_server --port 8000 --films 5000 --latency-ms 20
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+PAGE_SIZE = 20
+MAX_PAGES = 20
+MAX_FILM_ID = 2 ** 31 - 1
+
+COUNTRIES = {1: "США", 3: "Франция", 5: "Великобритания", 8: "Испания",
+             9: "Германия", 10: "Италия", 14: "Канада", 16: "Япония",
+             21: "Китай", 34: "Россия"}
+GENRES = {1: "триллер", 2: "драма", 3: "криминал", 4: "мелодрама",
+          5: "детектив", 6: "фантастика", 7: "приключения", 8: "биография",
+          11: "боевик", 12: "фэнтези", 13: "комедия", 14: "военный",
+          17: "ужасы", 18: "мультфильм", 19: "семейный"}
+TYPES = ("FILM", "FILM", "FILM", "FILM", "TV_SERIES", "MINI_SERIES", "TV_SHOW")
+TOP_TYPES = ("TOP_250_BEST_FILMS", "TOP_100_POPULAR_FILMS", "TOP_AWAIT_FILMS")
+ORDERS = ("RATING", "NUM_VOTE", "YEAR")
+
+TITLE_WORDS = ("Тайна", "Последний", "Город", "Остров", "Путь", "Тень",
+               "Звезда", "Граница", "Охота", "Легенда", "Сердце", "Мост",
+               "Ночь", "Дорога", "Побег", "Шторм", "Код", "Берег")
+TITLE_TAILS = ("героя", "времени", "севера", "дракона", "океана", "ветра",
+               "призраков", "воина", "короля", "льда", "огня", "памяти")
+EN_WORDS = ("Secret", "Last", "City", "Island", "Way", "Shadow", "Star",
+            "Border", "Hunt", "Legend", "Heart", "Bridge", "Night", "Road")
+
+# Фильмы, на которые опираются тесты (поиск "миньоны", фильтры 2020 года и т.д.)
+KNOWN_FILMS = (
+    {"id": 326, "nameRu": "Побег из Шоушенка", "nameEn": "The Shawshank Redemption",
+     "year": 1994, "countries": [1], "genres": [2], "rating": 9.1, "votes": 1000000},
+    {"id": 435, "nameRu": "Зеленая миля", "nameEn": "The Green Mile",
+     "year": 1999, "countries": [1], "genres": [2, 3, 12], "rating": 9.1, "votes": 900000},
+    {"id": 301, "nameRu": "Матрица", "nameEn": "The Matrix",
+     "year": 1999, "countries": [1], "genres": [6, 11], "rating": 8.5, "votes": 800000},
+    {"id": 258687, "nameRu": "Интерстеллар", "nameEn": "Interstellar",
+     "year": 2014, "countries": [1, 5], "genres": [6, 2, 7], "rating": 8.6, "votes": 950000},
+    {"id": 447301, "nameRu": "Начало", "nameEn": "Inception",
+     "year": 2010, "countries": [1, 5], "genres": [6, 11, 1], "rating": 8.7, "votes": 930000},
+    {"id": 252002, "nameRu": "Гадкий я", "nameEn": "Despicable Me",
+     "year": 2010, "countries": [1], "genres": [18, 13, 19], "rating": 7.8, "votes": 400000},
+    {"id": 676266, "nameRu": "Миньоны", "nameEn": "Minions",
+     "year": 2015, "countries": [1], "genres": [18, 13, 19], "rating": 6.4, "votes": 200000},
+    {"id": 1236063, "nameRu": "Довод", "nameEn": "Tenet",
+     "year": 2020, "countries": [1, 5], "genres": [6, 11, 1], "rating": 7.6, "votes": 300000},
+)
+
+
+def generate_films(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Сгенерировать набор фильмов
+
+    Args:
+        count: Общий размер набора (включая KNOWN_FILMS)
+        seed: Зерно генератора, одинаковое зерно дает одинаковый набор
+    """
+    rnd = random.Random(seed)
+    films = [dict(film, type="FILM", filmLength=120) for film in KNOWN_FILMS]
+    country_ids, genre_ids = list(COUNTRIES), list(GENRES)
+
+    for index in range(max(count - len(films), 0)):
+        films.append({
+            "id": 1000000 + index,
+            "nameRu": f"{rnd.choice(TITLE_WORDS)} {rnd.choice(TITLE_TAILS)} {index}",
+            "nameEn": f"{rnd.choice(EN_WORDS)} {index}",
+            "year": rnd.randint(1950, 2024),
+            "type": rnd.choice(TYPES),
+            "countries": rnd.sample(country_ids, rnd.randint(1, 2)),
+            "genres": rnd.sample(genre_ids, rnd.randint(1, 3)),
+            "rating": round(rnd.uniform(3.0, 9.0), 1),
+            "votes": rnd.randint(100, 500000),
+            "filmLength": rnd.randint(70, 180),
+        })
+    return films
+
+
+def _countries(film: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [{"country": COUNTRIES[country_id]} for country_id in film["countries"]]
+
+
+def _genres(film: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [{"genre": GENRES[genre_id]} for genre_id in film["genres"]]
+
+
+def _poster(film: Dict[str, Any]) -> Dict[str, str]:
+    url = f"https://kinopoiskapiunofficial.tech/images/posters/kp/{film['id']}.jpg"
+    return {"posterUrl": url, "posterUrlPreview": url.replace("/kp/", "/kp_small/")}
+
+
+def short_film(film: Dict[str, Any]) -> Dict[str, Any]:
+    """Элемент списков search-by-keyword и films/top"""
+    return {
+        "filmId": film["id"],
+        "nameRu": film["nameRu"],
+        "nameEn": film["nameEn"],
+        "type": film["type"],
+        "year": str(film["year"]),
+        "filmLength": f"{film['filmLength'] // 60}:{film['filmLength'] % 60:02d}",
+        "countries": _countries(film),
+        "genres": _genres(film),
+        "rating": f"{film['rating']:.1f}",
+        "ratingVoteCount": film["votes"],
+        "ratingChange": None,
+        **_poster(film),
+    }
+
+
+def full_film(film: Dict[str, Any]) -> Dict[str, Any]:
+    """Элемент /api/v2.2/films и ответ /api/v2.2/films/{id}"""
+    return {
+        "kinopoiskId": film["id"],
+        "imdbId": f"tt{film['id']:07d}",
+        "nameRu": film["nameRu"],
+        "nameEn": film["nameEn"],
+        "nameOriginal": film["nameEn"],
+        "countries": _countries(film),
+        "genres": _genres(film),
+        "ratingKinopoisk": film["rating"],
+        "ratingKinopoiskVoteCount": film["votes"],
+        "ratingImdb": film["rating"],
+        "year": film["year"],
+        "filmLength": film["filmLength"],
+        "type": film["type"],
+        **_poster(film),
+    }
+
+
+class ApiError(Exception):
+    """Ответ с ошибкой в формате реального API"""
+
+    def __init__(self, status: int, message: str,
+                 headers: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+class TokenBucket:
+    """Ограничитель частоты запросов для имитации 429"""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        # При частоте меньше 1 запроса в секунду емкость все равно один токен
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Взять токен; вернуть 0 или сколько секунд ждать следующего"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class FakeKinopoiskApi:
+    """Данные и маршрутизация заменителя API"""
+
+    def __init__(self, films: int = 1000, seed: int = 42, latency_ms: float = 0,
+                 jitter_ms: float = 0, error_rate: float = 0, rate_limit: float = 0,
+                 api_key: Optional[str] = None) -> None:
+        """
+        Args:
+            films: Размер генерируемого набора фильмов
+            seed: Зерно генератора данных и ошибок
+            latency_ms: Искусственная задержка каждого ответа
+            jitter_ms: Случайная добавка к задержке (0..jitter_ms)
+            error_rate: Доля запросов, на которые отвечать 500
+            rate_limit: Допустимое число запросов в секунду (0 - без лимита)
+            api_key: Единственный допустимый ключ (None - любой непустой)
+        """
+        self.films = generate_films(films, seed)
+        self.by_id = {film["id"]: film for film in self.films}
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.api_key = api_key
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+    def handle(self, path: str, query: Dict[str, List[str]],
+               headers) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """Обработать запрос и вернуть (статус, тело, заголовки)"""
+        with self.random_lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+
+        try:
+            if self.bucket:
+                retry_after = self.bucket.acquire()
+                if retry_after:
+                    raise ApiError(429, "Too many requests",
+                                   {"Retry-After": str(math.ceil(retry_after))})
+            key = headers.get("X-API-KEY")
+            if not key or (self.api_key and key != self.api_key):
+                raise ApiError(401, "You don't have permissions. "
+                                    "See https://kinopoiskapiunofficial.tech")
+            if failed:
+                raise ApiError(500, "Internal server error")
+            return 200, self.route(path, query), {}
+        except ApiError as error:
+            return error.status, {"message": error.message}, error.headers
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        params = {name: values[-1] for name, values in query.items()}
+        if path == "/api/v2.1/films/search-by-keyword":
+            return self.search_by_keyword(params)
+        if path == "/api/v2.2/films":
+            return self.filter_films(params)
+        if path == "/api/v2.2/films/top":
+            return self.top(params)
+        match = re.fullmatch(r"/api/v2\.2/films/([^/]+)", path)
+        if match:
+            return self.film(match.group(1))
+        raise ApiError(404, f"Path {path} not found")
+
+    @staticmethod
+    def _int(params: Dict[str, str], name: str, default: Optional[int] = None,
+             low: int = None, high: int = None) -> Optional[int]:
+        value = params.get(name)
+        if value is None or value == "":
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise ApiError(400, f"Parameter '{name}' must be an integer")
+        if (low is not None and number < low) or (high is not None and number > high):
+            raise ApiError(400, f"Parameter '{name}' must be between {low} and {high}")
+        return number
+
+    @staticmethod
+    def _float(params: Dict[str, str], name: str, default: float) -> float:
+        value = params.get(name)
+        if value is None or value == "":
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            raise ApiError(400, f"Parameter '{name}' must be a number")
+
+    @staticmethod
+    def _page(items: List[Any], page: int) -> List[Any]:
+        start = (page - 1) * PAGE_SIZE
+        return items[start:start + PAGE_SIZE]
+
+    def search_by_keyword(self, params: Dict[str, str]) -> Dict[str, Any]:
+        keyword = params.get("keyword", "").strip()
+        if not keyword:
+            raise ApiError(400, "Parameter 'keyword' is required")
+        page = self._int(params, "page", 1, 1, MAX_PAGES)
+        needle = keyword.casefold()
+        found = sorted(
+            (film for film in self.films
+             if needle in film["nameRu"].casefold() or needle in film["nameEn"].casefold()),
+            key=lambda film: -film["votes"])
+        return {
+            "keyword": keyword,
+            "pagesCount": min(math.ceil(len(found) / PAGE_SIZE), MAX_PAGES),
+            "searchFilmsCountResult": len(found),
+            "films": [short_film(film) for film in self._page(found, page)],
+        }
+
+    def filter_films(self, params: Dict[str, str]) -> Dict[str, Any]:
+        country = self._int(params, "countries")
+        genre = self._int(params, "genres")
+        order = params.get("order", "RATING")
+        if order not in ORDERS:
+            raise ApiError(400, f"Parameter 'order' must be one of {ORDERS}")
+        film_type = params.get("type", "ALL")
+        rating_from = self._float(params, "ratingFrom", 0)
+        rating_to = self._float(params, "ratingTo", 10)
+        year_from = self._int(params, "yearFrom", 1000)
+        year_to = self._int(params, "yearTo", 3000)
+        keyword = params.get("keyword", "").casefold()
+        page = self._int(params, "page", 1, 1, MAX_PAGES)
+
+        found = [
+            film for film in self.films
+            if (country is None or country in film["countries"])
+            and (genre is None or genre in film["genres"])
+            and (film_type == "ALL" or film["type"] == film_type)
+            and rating_from <= film["rating"] <= rating_to
+            and year_from <= film["year"] <= year_to
+            and (not keyword or keyword in film["nameRu"].casefold())
+        ]
+        sort_key = {"RATING": "rating", "NUM_VOTE": "votes", "YEAR": "year"}[order]
+        found.sort(key=lambda film: (-film[sort_key], film["id"]))
+        return {
+            "total": len(found),
+            "totalPages": min(math.ceil(len(found) / PAGE_SIZE), MAX_PAGES),
+            "items": [full_film(film) for film in self._page(found, page)],
+        }
+
+    def top(self, params: Dict[str, str]) -> Dict[str, Any]:
+        top_type = params.get("type", "TOP_250_BEST_FILMS")
+        if top_type not in TOP_TYPES:
+            raise ApiError(400, f"Parameter 'type' must be one of {TOP_TYPES}")
+        films = [film for film in self.films if film["type"] == "FILM"]
+        if top_type == "TOP_250_BEST_FILMS":
+            ranked = sorted(films, key=lambda film: (-film["rating"], film["id"]))[:250]
+        elif top_type == "TOP_100_POPULAR_FILMS":
+            ranked = sorted(films, key=lambda film: (-film["votes"], film["id"]))[:100]
+        else:
+            ranked = sorted((film for film in films if film["year"] >= 2024),
+                            key=lambda film: film["id"])
+        pages = math.ceil(len(ranked) / PAGE_SIZE)
+        page = self._int(params, "page", 1, 1, max(pages, 1))
+        return {
+            "pagesCount": pages,
+            "films": [short_film(film) for film in self._page(ranked, page)],
+        }
+
+    def film(self, raw_id: str) -> Dict[str, Any]:
+        if not raw_id.isdigit() or not 1 <= int(raw_id) <= MAX_FILM_ID:
+            raise ApiError(400, f"Film id must be an integer between 1 and {MAX_FILM_ID}")
+        film = self.by_id.get(int(raw_id))
+        if film is None:
+            raise ApiError(404, "Film not found")
+        return full_film(film)
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """HTTP обработчик с keep-alive (HTTP/1.1)"""
+
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными записями: без TCP_NODELAY
+    # keep-alive соединение ловит задержку Nagle + delayed ACK (~40 мс)
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        status, body, headers = self.server.app.handle(
+            parts.path, parse_qs(parts.query), self.headers)
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        if status == 200:
+            # Данные неизменны, поэтому ETag - хэш тела; на совпадение отвечаем 304
+            etag = f'"{hashlib.sha1(payload).hexdigest()[:16]}"'
+            headers = dict(headers, ETag=etag)
+            if self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+        self._send(status, payload, headers)
+
+    def do_HEAD(self) -> None:
+        self._send(200, b"", {}, head=True)
+
+    def _send(self, status: int, payload: bytes, headers: Dict[str, str],
+              head: bool = False) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(payload)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class FakeApiServer:
+    """Заменитель API в фоновом потоке"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options: Any) -> None:
+        """
+        Args:
+            host: Адрес прослушивания
+            port: Порт (0 - выбрать свободный)
+            options: Параметры FakeKinopoiskApi
+        """
+        self.httpd = ThreadingHTTPServer((host, port), FakeApiHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.app = FakeKinopoiskApi(**options)
+        self.thread = None
+
+    @property
+    def app(self) -> FakeKinopoiskApi:
+        return self.httpd.app
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeApiServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальный заменитель API Кинопоиска")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--films", type=int, default=1000, help="Размер набора фильмов")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0,
+                        help="Доля ответов 500 (0..1)")
+    parser.add_argument("--rate-limit", type=float, default=0,
+                        help="Запросов в секунду до ответа 429 (0 - без лимита)")
+    parser.add_argument("--api-key", default=None,
+                        help="Допустимый X-API-KEY (по умолчанию любой непустой)")
+    args = parser.parse_args()
+
+    server = FakeApiServer(args.host, args.port, films=args.films, seed=args.seed,
+                           latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate, rate_limit=args.rate_limit,
+                           api_key=args.api_key)
+    print(f"🚀 Заменитель API запущен: {server.base_url} (API_BASE_URL)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+        print("🔚 Заменитель API остановлен")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+from .cassette import SKIPPED_HEADERS, cassette_key, restore_recorded_elapsed
+from .client import NetworkAdapter
+
+
+class CachingAdapter(NetworkAdapter):
+    """
+    Дисковый HTTP кэш для GET запросов API только на чтение
+
+    Ответ 200 хранится с ETag/Last-Modified. Пока запись моложе ttl,
+    она отдается без сети; после этого выполняется условный запрос
+    (If-None-Match/If-Modified-Since), и на 304 тело берется с диска.
+    При превышении max_bytes удаляются давно не использованные записи.
+    Заголовок запроса Cache-Control: no-cache и флаг bypass отправляют
+    запрос мимо кэша.
+    """
+
+    def __init__(self, directory: str, ttl: float = 86400,
+                 max_bytes: int = 50 * 1024 * 1024, **kwargs) -> None:
+        """
+        Args:
+            directory: Каталог записей кэша
+            ttl: Сколько секунд запись считается свежей без перепроверки
+            max_bytes: Предельный размер кэша на диске
+        """
+        super().__init__(**kwargs)
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bypass = False
+        self.stats: Dict[str, int] = {"hit": 0, "revalidated": 0, "miss": 0, "bypass": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, request: requests.PreparedRequest) -> str:
+        key = json.dumps(cassette_key(request), ensure_ascii=False, sort_keys=True)
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def send(self, request, **kwargs):
+        no_cache = "no-cache" in request.headers.get("Cache-Control", "")
+        if request.method != "GET" or self.bypass or no_cache:
+            self._count("bypass")
+            return super().send(request, **kwargs)
+
+        started = time.perf_counter()
+        path = self._path(request)
+        entry = self._read(path)
+        if entry and time.time() - entry["validated_at"] < self.ttl:
+            self._touch(path)
+            self._count("hit")
+            return self._build(request, entry, "HIT", time.perf_counter() - started)
+
+        if entry:
+            if entry.get("etag"):
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, **kwargs)
+        if entry and response.status_code == 304:
+            response.content  # освобождаем соединение пула
+            entry["validated_at"] = time.time()
+            self._write(path, entry)
+            self._count("revalidated")
+            return self._build(request, entry, "REVALIDATED", time.perf_counter() - started)
+
+        self._count("miss")
+        if response.status_code == 200:
+            self._store(path, response)
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    def _read(self, path: str) -> Optional[dict]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _touch(self, path: str) -> None:
+        """Время изменения файла - время последнего использования (для LRU)"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write(self, path: str, entry: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _store(self, path: str, response: requests.Response) -> None:
+        try:
+            body = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            return
+        self._write(path, {
+            "url": response.url,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": {name: value for name, value in response.headers.items()
+                        if name.lower() not in SKIPPED_HEADERS},
+            "body": body,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "validated_at": time.time(),
+        })
+        self._evict()
+
+    def _evict(self) -> None:
+        """Удалить давно не использованные записи сверх max_bytes"""
+        entries = []
+        for item in os.scandir(self.directory):
+            if item.name.endswith(".json"):
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def _build(self, request, entry: dict, outcome: str,
+               elapsed: float) -> requests.Response:
+        """Собрать Response из записи кэша"""
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers["X-Cache"] = outcome
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.recorded_elapsed = elapsed
+        return response
+
+    def summary(self) -> str:
+        return (f"попаданий {self.stats['hit']}, перепроверено (304) "
+                f"{self.stats['revalidated']}, промахов {self.stats['miss']}, "
+                f"мимо кэша {self.stats['bypass']}")
+
+
+def use_http_cache(client, directory: str, ttl: float = 86400,
+                   max_bytes: int = 50 * 1024 * 1024) -> CachingAdapter:
+    """
+    Подключить дисковый кэш к клиенту API
+
+    Args:
+        client: KinopoiskApiClient
+        directory: Каталог записей кэша
+        ttl: Свежесть записи без перепроверки, секунды
+        max_bytes: Предельный размер кэша
+
+    Returns:
+        Адаптер кэша (флаг bypass и статистика stats)
+    """
+    adapter = CachingAdapter(directory, ttl, max_bytes,
+                             pool_connections=client.pool_size,
+                             pool_maxsize=client.pool_size)
+    client.mount(adapter)
+    if restore_recorded_elapsed not in client.session.hooks["response"]:
+        client.session.hooks["response"].append(restore_recorded_elapsed)
+    return adapter
@@ -0,0 +1,303 @@
+"""
+Нагрузочный режим на сценариях API тестов
+
+Виртуальные пользователи на asyncio выполняют те же сценарии и те же
+проверки, что и tests/test_api.py (api/scenarios.py). Запросы уходят
+через aiohttp с общим пулом соединений, поэтому число одновременных
+запросов ограничено только --users и размером пула, а не потоками.
+Запуск:
+
+    python -m api.load --users 20 --ramp-up 10 --duration 60 --rps 50 \\
+        --scenario search_by_keyword --scenario top_250 --report load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+import aiohttp
+from dotenv import load_dotenv
+from .scenarios import SCENARIOS, ApiScenario
+from .stats import summarize
+
+
+class Sample:
+    """Результат одного запроса"""
+
+    __slots__ = ("offset", "scenario", "latency", "error")
+
+    def __init__(self, offset: float, scenario: str, latency: float,
+                 error: Optional[str]) -> None:
+        self.offset = offset
+        self.scenario = scenario
+        self.latency = latency
+        self.error = error
+
+
+class AsyncResponse:
+    """Ответ aiohttp с интерфейсом requests.Response, нужным проверкам сценариев"""
+
+    def __init__(self, status_code: int, body: bytes) -> None:
+        self.status_code = status_code
+        self.content = body
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncKinopoiskApiClient:
+    """
+    Асинхронный клиент API Кинопоиска для нагрузки
+
+    Методы повторяют KinopoiskApiClient, поэтому сценарии из
+    api/scenarios.py работают с ним без изменений (send возвращает
+    корутину). Все пользователи делят один aiohttp.TCPConnector.
+    """
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+                 pool_size: int = 100, timeout: float = 30) -> None:
+        """
+        Args:
+            base_url: Базовый URL API
+            headers: Заголовки по умолчанию (в том числе X-API-KEY)
+            pool_size: Максимум одновременных соединений
+            timeout: Таймаут запроса в секундах
+        """
+        self.base_url = (base_url or "").rstrip("/")
+        self.headers = {name: value for name, value in (headers or {}).items()
+                        if value is not None}
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncKinopoiskApiClient":
+        # Сессия создается внутри цикла событий, в котором будет работать
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size, limit_per_host=self.pool_size),
+            timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.session.close()
+        self.session = None
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+                  authorized: bool = True) -> AsyncResponse:
+        """GET запрос к API; authorized=False - без X-API-KEY"""
+        headers = dict(self.headers)
+        if not authorized:
+            headers.pop("X-API-KEY", None)
+        query = {name: str(value) for name, value in (params or {}).items()}
+        async with self.session.get(f"{self.base_url}{path}", params=query,
+                                    headers=headers) as response:
+            return AsyncResponse(response.status, await response.read())
+
+    def search_by_keyword(self, keyword: str, page: Optional[int] = None):
+        params: Dict[str, Any] = {"keyword": keyword}
+        if page is not None:
+            params["page"] = page
+        return self.get("/api/v2.1/films/search-by-keyword", params)
+
+    def get_films(self, **filters: Any):
+        return self.get("/api/v2.2/films", filters)
+
+    def get_top(self, top_type: str = "TOP_250_BEST_FILMS", page: int = 1):
+        return self.get("/api/v2.2/films/top", {"type": top_type, "page": page})
+
+    def get_film(self, film_id: int, authorized: bool = True):
+        return self.get(f"/api/v2.2/films/{film_id}", authorized=authorized)
+
+
+class AsyncRateLimiter:
+    """Равномерное распределение запросов всех пользователей под целевой RPS"""
+
+    def __init__(self, rps: float) -> None:
+        self.interval = 1 / rps
+        self.next_slot = 0.0
+
+    async def wait(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(self.next_slot, now)
+        self.next_slot = slot + self.interval
+        await asyncio.sleep(slot - now)
+
+
+class LoadReport:
+    """Итоги нагрузки: пропускная способность, ошибки и перцентили во времени"""
+
+    def __init__(self, samples: List[Sample], duration: float, interval: float) -> None:
+        self.samples = samples
+        self.duration = duration
+        self.interval = interval
+
+    @staticmethod
+    def _window(samples: Sequence[Sample], seconds: float) -> Dict[str, Any]:
+        errors = sum(1 for sample in samples if sample.error)
+        return {
+            "requests": len(samples),
+            "errors": errors,
+            "error_rate": errors / len(samples) if samples else 0.0,
+            "throughput": len(samples) / seconds if seconds else 0.0,
+            "latency": summarize([sample.latency for sample in samples]),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Сводка по всему прогону и по каждому сценарию"""
+        result = self._window(self.samples, self.duration)
+        result["errors_by_type"] = dict(Counter(
+            sample.error for sample in self.samples if sample.error).most_common())
+        result["scenarios"] = {
+            name: self._window([sample for sample in self.samples
+                                if sample.scenario == name], self.duration)
+            for name in sorted({sample.scenario for sample in self.samples})
+        }
+        return result
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        """Метрики по окнам длиной interval секунд"""
+        windows: Dict[int, List[Sample]] = {}
+        for sample in self.samples:
+            windows.setdefault(int(sample.offset // self.interval), []).append(sample)
+        return [dict(self._window(windows[index], self.interval),
+                     start=index * self.interval)
+                for index in sorted(windows)]
+
+    def format(self) -> str:
+        """Текстовый отчет для консоли"""
+        summary = self.summary()
+        latency = summary["latency"]
+        lines = [
+            f"Запросов: {summary['requests']}, ошибок: {summary['errors']} "
+            f"({summary['error_rate']:.2%}), пропускная способность: "
+            f"{summary['throughput']:.1f} запр/с",
+            f"Задержка: p50={latency['p50'] * 1000:.1f} мс, "
+            f"p95={latency['p95'] * 1000:.1f} мс, p99={latency['p99'] * 1000:.1f} мс, "
+            f"max={latency['max'] * 1000:.1f} мс",
+            "",
+            f"{'окно, с':>8} {'запр/с':>8} {'ошибки':>8} {'p50, мс':>9} "
+            f"{'p95, мс':>9} {'p99, мс':>9}",
+        ]
+        for window in self.timeline():
+            latency = window["latency"]
+            lines.append(
+                f"{window['start']:>8.0f} {window['throughput']:>8.1f} "
+                f"{window['error_rate']:>8.1%} {latency['p50'] * 1000:>9.1f} "
+                f"{latency['p95'] * 1000:>9.1f} {latency['p99'] * 1000:>9.1f}")
+        for error, count in summary["errors_by_type"].items():
+            lines.append(f"❌ {count} x {error}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"duration": self.duration, "summary": self.summary(),
+                "timeline": self.timeline()}
+
+
+class LoadTest:
+    """Генератор нагрузки с виртуальными пользователями на asyncio"""
+
+    def __init__(self, client: AsyncKinopoiskApiClient, scenarios: Sequence[ApiScenario],
+                 users: int = 10, ramp_up: float = 0, duration: float = 60,
+                 rps: float = 0, interval: float = 5) -> None:
+        """
+        Args:
+            client: Асинхронный клиент API (пул не меньше числа пользователей)
+            scenarios: Сценарии, которые пользователи выполняют по кругу
+            users: Число одновременных виртуальных пользователей
+            ramp_up: За сколько секунд запускаются все пользователи
+            duration: Длительность нагрузки в секундах (включая ramp_up)
+            rps: Целевое число запросов в секунду на всех (0 - без ограничения)
+            interval: Длина окна для метрик во времени
+        """
+        self.client = client
+        self.scenarios = list(scenarios)
+        self.users = users
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.limiter = AsyncRateLimiter(rps) if rps else None
+        self.interval = interval
+        self.samples: List[Sample] = []
+
+    async def _call(self, scenario: ApiScenario) -> tuple:
+        """Выполнить запрос сценария и его проверки"""
+        started = time.perf_counter()
+        try:
+            response = await scenario.send(self.client)
+            latency = time.perf_counter() - started
+            scenario.validate(response)
+            return latency, None
+        except AssertionError as error:
+            return time.perf_counter() - started, f"{scenario.name}: {error}"
+        except Exception as error:
+            return time.perf_counter() - started, f"{scenario.name}: {type(error).__name__}"
+
+    async def _user(self, index: int, started: float, deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        if self.ramp_up:
+            await asyncio.sleep(self.ramp_up * index / self.users)
+
+        step = index
+        while loop.time() < deadline:
+            if self.limiter:
+                await self.limiter.wait()
+                if loop.time() >= deadline:
+                    break
+            scenario = self.scenarios[step % len(self.scenarios)]
+            step += 1
+            offset = loop.time() - started
+            latency, error = await self._call(scenario)
+            self.samples.append(Sample(offset, scenario.name, latency, error))
+
+    async def run(self) -> LoadReport:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.duration
+        async with self.client:
+            await asyncio.gather(*(self._user(index, started, deadline)
+                                   for index in range(self.users)))
+        return LoadReport(self.samples, loop.time() - started, self.interval)
+
+    def execute(self) -> LoadReport:
+        """Запустить нагрузку и дождаться отчета"""
+        return asyncio.run(self.run())
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Нагрузка на сценариях API тестов")
+    parser.add_argument("--base-url", default=os.getenv("API_BASE_URL"))
+    parser.add_argument("--api-key", default=os.getenv("API_KEY"))
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Сценарий (можно несколько, по умолчанию все)")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--ramp-up", type=float, default=0)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--rps", type=float, default=0, help="Целевой RPS (0 - максимум)")
+    parser.add_argument("--interval", type=float, default=5,
+                        help="Окно метрик во времени, секунды")
+    parser.add_argument("--report", help="Сохранить отчет в JSON файл")
+    args = parser.parse_args()
+
+    client = AsyncKinopoiskApiClient(
+        args.base_url,
+        headers={"X-API-KEY": args.api_key, "Content-Type": "application/json"},
+        pool_size=args.users)
+    scenarios = [SCENARIOS[name] for name in (args.scenario or SCENARIOS)]
+
+    print(f"🚀 Нагрузка на {args.base_url}: {args.users} пользователей, "
+          f"{args.duration:.0f} с, сценарии: {', '.join(s.name for s in scenarios)}")
+    report = LoadTest(client, scenarios, users=args.users, ramp_up=args.ramp_up,
+                      duration=args.duration, rps=args.rps,
+                      interval=args.interval).execute()
+
+    print(report.format())
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"💾 Отчет сохранен: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
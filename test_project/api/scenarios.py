@@ -0,0 +1,112 @@
+"""
+Сценарии API тестов: запрос и проверки ответа
+
+Одни и те же определения используются функциональными тестами
+(tests/test_api.py) и нагрузочным режимом (api/load.py), поэтому
+проверки не нужно синхронизировать вручную.
+"""
+from typing import Any, Callable, Dict
+import requests
+from .client import KinopoiskApiClient
+
+
+def check_keyword_search(response_data: Dict[str, Any]) -> None:
+    """Структура ответа search-by-keyword"""
+    assert "films" in response_data, "В ответе отсутствует ключ 'films'"
+    assert len(response_data["films"]) > 0, "Список фильмов пуст"
+
+    film = response_data["films"][0]
+    assert "filmId" in film, "В фильме отсутствует ID"
+    assert "nameRu" in film or "nameEn" in film, "В фильме отсутствует название"
+
+
+def check_filtered_search(response_data: Dict[str, Any]) -> None:
+    """Структура ответа /api/v2.2/films"""
+    assert "items" in response_data, "В ответе отсутствует ключ 'items'"
+    assert len(response_data["items"]) > 0, "Список фильмов пуст"
+
+    film = response_data["items"][0]
+    assert "kinopoiskId" in film, "В фильме отсутствует kinopoiskId"
+    assert "genres" in film, "В фильме отсутствует информация о жанрах"
+    assert "countries" in film, "В фильме отсутствует информация о странах"
+
+
+def check_top_films(response_data: Dict[str, Any]) -> None:
+    """Структура ответа /api/v2.2/films/top"""
+    assert "films" in response_data, "В ответе отсутствует ключ 'films'"
+    assert len(response_data["films"]) > 0, "Список фильмов пуст"
+
+    film = response_data["films"][0]
+    assert "filmId" in film, "В фильме отсутствует filmId"
+    assert "rating" in film, "В фильме отсутствует рейтинг"
+
+
+def check_error_message(response_data: Dict[str, Any]) -> None:
+    """Ответ с ошибкой содержит сообщение"""
+    assert "message" in response_data, "В ответе отсутствует сообщение об ошибке"
+
+
+class ApiScenario:
+    """Запрос сценария и ожидаемый ответ"""
+
+    def __init__(self, name: str, request: Callable[[KinopoiskApiClient], requests.Response],
+                 expected_status: int, check_body: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Args:
+            name: Имя сценария (ключ базовой линии и отчета нагрузки)
+            request: Функция, отправляющая запрос через клиент
+            expected_status: Ожидаемый статус код
+            check_body: Проверка тела ответа
+        """
+        self.name = name
+        self.request = request
+        self.expected_status = expected_status
+        self.check_body = check_body
+
+    def send(self, client: KinopoiskApiClient) -> requests.Response:
+        """Отправить запрос сценария"""
+        return self.request(client)
+
+    def check_status(self, response: requests.Response) -> None:
+        """Проверить статус код ответа"""
+        assert response.status_code == self.expected_status, (
+            f"Ожидался статус {self.expected_status}, получен {response.status_code}")
+
+    def validate(self, response: requests.Response) -> None:
+        """Все проверки сценария: статус и тело ответа"""
+        self.check_status(response)
+        self.check_body(response.json())
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+    ApiScenario(
+        "search_by_keyword",
+        lambda client: client.search_by_keyword("миньоны"),
+        200, check_keyword_search),
+    ApiScenario(
+        "search_with_filters",
+        lambda client: client.get_films(
+            countries=1,
+            genres=11,
+            order="RATING",
+            type="FILM",
+            ratingFrom=7,
+            ratingTo=10,
+            yearFrom=2020,
+            yearTo=2020,
+            page=1
+        ),
+        200, check_filtered_search),
+    ApiScenario(
+        "top_250",
+        lambda client: client.get_top("TOP_250_BEST_FILMS", page=1),
+        200, check_top_films),
+    ApiScenario(
+        "without_api_key",
+        lambda client: client.get_film(252002, authorized=False),
+        401, check_error_message),
+    ApiScenario(
+        "nonexistent_film",
+        lambda client: client.get_film(29999999999),
+        400, check_error_message),
+)}
@@ -0,0 +1,58 @@
+import math
+from typing import Dict, List, Sequence, Tuple
+
+
+# Границы корзин гистограммы задержек в секундах
+HISTOGRAM_BOUNDS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, math.inf)
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Перцентиль с линейной интерполяцией между соседними значениями"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Сводка по задержкам: количество, среднее, p50/p95/p99, min и max"""
+    if not values:
+        return {"count": 0, "mean": 0.0, "min": 0.0, "p50": 0.0,
+                "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "min": min(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def histogram(values: Sequence[float],
+              bounds: Sequence[float] = HISTOGRAM_BOUNDS) -> List[Tuple[float, int]]:
+    """Количество значений в каждой корзине (верхняя граница, количество)"""
+    counts = [0] * len(bounds)
+    for value in values:
+        for index, bound in enumerate(bounds):
+            if value <= bound:
+                counts[index] += 1
+                break
+    return list(zip(bounds, counts))
+
+
+def format_histogram(values: Sequence[float], width: int = 40) -> str:
+    """Текстовая гистограмма задержек для отчета"""
+    buckets = histogram(values)
+    peak = max((count for _, count in buckets), default=0) or 1
+    lines = []
+    for bound, count in buckets:
+        label = "   inf" if math.isinf(bound) else f"{bound * 1000:6.0f}"
+        bar = "#" * round(count / peak * width)
+        lines.append(f"<= {label} мс | {count:5d} {bar}")
+    return "\n".join(lines)
@@ -1,7 +1,11 @@
+import json
 import os
 import sys
 import pytest
+import allure
+import allure_commons
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from dotenv import load_dotenv
@@ -11,29 +15,305 @@ sys.path.insert(0, project_root)
 
 load_dotenv()
 
+REPORTS_DIR = os.getenv("REPORTS_DIR", os.path.join(project_root, "reports"))
+DRIVERS_DIR = os.getenv("DRIVERS_DIR", os.path.join(project_root, "drivers"))
+startup_timings_key = pytest.StashKey[dict]()
+profiler_key = pytest.StashKey["CommandProfiler"]()
+browser_reset_key = pytest.StashKey["BrowserReset"]()
+page_metrics_key = pytest.StashKey["PageMetricsCollector"]()
+api_cache_key = pytest.StashKey["CachingAdapter"]()
+duration_history_key = pytest.StashKey["DurationHistory"]()
+health_key = pytest.StashKey["HealthMonitor"]()
+snapshots_key = pytest.StashKey["SnapshotRecorder"]()
+artifacts_key = pytest.StashKey["FailureArtifacts"]()
+memory_watchdog_key = pytest.StashKey["MemoryWatchdog"]()
+
+from tests.pages.selector_ranking import get_selector_ranking  # noqa: E402
+from tests.pages.locators import PAGES  # noqa: E402
+from tests.pages.static_page import StaticClient  # noqa: E402
+from utils.profiles import worker_profile_dir  # noqa: E402
+from utils.network import ResourcePolicy, network_stats  # noqa: E402
+from utils.drivers import DriverProvisioner, StartupTimer, apply_host_arguments  # noqa: E402
+from utils.timing import format_slowest, get_step_timer  # noqa: E402
+from utils.commands import CommandProfiler, add_command_listener  # noqa: E402
+from utils.reset import BrowserReset  # noqa: E402
+from utils.perf import PageMetricsCollector, PerfBudgets  # noqa: E402
+from utils.health import HealthMonitor, is_captcha_url  # noqa: E402
+from utils.snapshots import SnapshotRecorder  # noqa: E402
+from utils.artifacts import FailureArtifacts  # noqa: E402
+from utils.browser_session import BrowserSession  # noqa: E402
+from utils.memory import MemoryWatchdog  # noqa: E402
+from utils.scheduling import (DurationHistory, DurationRecorder, balance_shards,  # noqa: E402
+                              longest_first, parse_shard, split_by_name)
+from api.client import KinopoiskApiClient  # noqa: E402
+from api.cassette import API_MODES, use_cassette  # noqa: E402
+from api.fake_server import FakeApiServer  # noqa: E402
+from api.benchmark import ApiBenchmark  # noqa: E402
+from api.crawler import PaginatedCrawler  # noqa: E402
+from api.http_cache import use_http_cache  # noqa: E402
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--api-mode", choices=API_MODES, default=os.getenv("API_MODE", "live"),
+        help="API тесты: live - реальный API, record - записать ответы, "
+             "replay - воспроизвести ответы с диска без сети")
+    parser.addoption(
+        "--cassette-dir",
+        default=os.getenv("CASSETTE_DIR", os.path.join(project_root, "cassettes")),
+        help="Каталог с записанными ответами API")
+    parser.addoption(
+        "--fake-api", action="store_true", default=False,
+        help="Запустить API тесты против локального заменителя API Кинопоиска")
+    parser.addoption(
+        "--api-cache", action="store_true",
+        default=os.getenv("API_CACHE", "0") == "1",
+        help="Кэшировать ответы API на диске с перепроверкой по ETag/Last-Modified")
+    parser.addoption(
+        "--search-corpus", default=os.getenv("SEARCH_CORPUS"),
+        help="CSV или JSONL корпус названий для массовой проверки поиска API")
+    parser.addoption(
+        "--benchmark", action="store_true", default=False,
+        help="Повторять каждый API сценарий и считать перцентили задержки")
+    parser.addoption(
+        "--benchmark-rounds", type=int, default=int(os.getenv("BENCHMARK_ROUNDS", 30)),
+        help="Число замеров каждого сценария")
+    parser.addoption(
+        "--benchmark-warmup", type=int, default=int(os.getenv("BENCHMARK_WARMUP", 3)),
+        help="Число прогревочных запросов перед замерами")
+    parser.addoption(
+        "--benchmark-baseline",
+        default=os.getenv("BENCHMARK_BASELINE",
+                          os.path.join(project_root, "benchmarks", "api_baseline.json")),
+        help="JSON файл с базовой линией задержек")
+    parser.addoption(
+        "--benchmark-tolerance", type=float,
+        default=float(os.getenv("BENCHMARK_TOLERANCE", 0.2)),
+        help="Допустимый рост p50/p95 относительно базовой линии (0.2 = 20%%)")
+    parser.addoption(
+        "--benchmark-save", action="store_true", default=False,
+        help="Сохранить результаты бенчмарка как новую базовую линию")
+    parser.addoption(
+        "--slowest-steps", type=int, default=int(os.getenv("SLOWEST_STEPS", 10)),
+        help="Сколько самых медленных шагов показать в конце сессии (0 - не показывать)")
+    parser.addoption(
+        "--profile-webdriver", action="store_true",
+        default=os.getenv("PROFILE_WEBDRIVER", "0") == "1",
+        help="Считать команды WebDriver и их время по тестам и местам вызова")
+    parser.addoption(
+        "--browser-reset", action="store_true",
+        default=os.getenv("BROWSER_RESET", "0") == "1",
+        help="Сбрасывать хранилища, cookies (кроме анти-капчи) и окна перед каждым UI тестом")
+    parser.addoption(
+        "--perf-budgets",
+        default=os.getenv("PERF_BUDGETS", os.path.join(project_root, "perf_budgets.json")),
+        help="JSON файл с бюджетами производительности страниц")
+    parser.addoption(
+        "--perf-strict", action="store_true",
+        default=os.getenv("PERF_STRICT", "0") == "1",
+        help="Падать при превышении бюджета производительности (иначе только отчет)")
+    parser.addoption(
+        "--durations-file",
+        default=os.getenv("DURATIONS_FILE", os.path.join(project_root, ".test_durations.json")),
+        help="JSON файл с историей длительности тестов")
+    parser.addoption(
+        "--shard", default=os.getenv("TEST_SHARD"),
+        help="Запустить только шард i/n, тесты распределяются по истории длительности")
+    parser.addoption(
+        "--longest-first", action="store_true",
+        default=os.getenv("LONGEST_FIRST", "0") == "1",
+        help="Запускать самые долгие по истории тесты первыми (для pytest-xdist)")
+    parser.addoption(
+        "--on-outage", choices=("skip", "fail"), default=os.getenv("ON_OUTAGE", "skip"),
+        help="Что делать с тестами, когда сайт или API недоступны: skip или fail")
+    parser.addoption(
+        "--save-snapshots", action="store_true",
+        default=os.getenv("SAVE_SNAPSHOTS", "0") == "1",
+        help="Сохранять снимки DOM посещенных страниц для проверки локаторов "
+             "(каталог SNAPSHOTS_DIR, по умолчанию snapshots/)")
+
+
+def pytest_configure(config):
+    """Подключить замер времени шагов Allure"""
+    allure_commons.plugin_manager.register(get_step_timer())
+    if config.getoption("--profile-webdriver"):
+        config.stash[profiler_key] = CommandProfiler(os.path.join(project_root, "tests"))
+    if config.getoption("--browser-reset"):
+        config.stash[browser_reset_key] = BrowserReset.from_env()
+
+    shard = config.getoption("--shard")
+    if shard:
+        try:
+            parse_shard(shard)
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    if os.getenv("HEALTH_CHECK", "1") == "1":
+        config.stash[health_key] = HealthMonitor(
+            interval=float(os.getenv("HEALTH_INTERVAL", 30)),
+            timeout=float(os.getenv("HEALTH_TIMEOUT", 10)))
+    if os.getenv("FAILURE_ARTIFACTS", "1") == "1":
+        try:
+            artifacts = FailureArtifacts.from_env(
+                getattr(config.option, "allure_report_dir", None),
+                os.path.join(REPORTS_DIR, "failures"))
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+        allure_commons.plugin_manager.register(artifacts)
+        config.stash[artifacts_key] = artifacts
+    if os.getenv("MEMORY_WATCHDOG", "1") == "1":
+        config.stash[memory_watchdog_key] = MemoryWatchdog.from_env(
+            os.path.join(REPORTS_DIR, "browser_memory.jsonl"))
+
+    history = DurationHistory(config.getoption("--durations-file"))
+    config.stash[duration_history_key] = history
+    # Отчеты всех воркеров xdist приходят контроллеру, историю пишет только он
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(DurationRecorder(history), "duration_recorder")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Шардирование и порядок запуска по истории длительности"""
+    # Маркер nojs обещает, что тест обходится без браузера
+    with_browser = [item.nodeid for item in items
+                    if item.get_closest_marker("nojs") is not None
+                    and {"driver", "browser_session"} & set(item.fixturenames)]
+    if with_browser:
+        raise pytest.UsageError(
+            "Тесты с маркером nojs не должны запускать браузер (фикстура driver): "
+            + ", ".join(with_browser))
+
+    shard = config.getoption("--shard")
+    longest = config.getoption("--longest-first")
+    if not shard and not longest:
+        return
+
+    history = config.stash[duration_history_key]
+    durations = {item.nodeid: history.estimate(item.nodeid) for item in items}
+    by_id = {item.nodeid: item for item in items}
+
+    if shard:
+        index, total = parse_shard(shard)
+        if history.durations:
+            shards = balance_shards(durations, total)
+        else:
+            # Без истории (чистый checkout) разбиение не зависит от длительностей
+            shards = split_by_name(list(durations), total)
+        selected = set(shards[index])
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+    if longest:
+        items[:] = [by_id[nodeid] for nodeid in
+                    longest_first([item.nodeid for item in items], durations)]
 
-@pytest.fixture(scope="session")  # ← ИЗМЕНИЛИ НА "session"
-def driver():
-    """Фикстура драйвера для всей сессии тестов"""
 
-    chromedriver_path = r"C:\Users\Михаил\Desktop\skypro_diplom_funal\skypro_diplom_funal\test_project\drivers\chromedriver.exe"
-    chrome_binary_path = r"C:\Program Files\Google\Chrome\chrome-win32\chrome.exe"
+def pytest_unconfigure(config):
+    allure_commons.plugin_manager.unregister(get_step_timer())
+    artifacts = config.stash.get(artifacts_key, None)
+    if artifacts:
+        artifacts.close()
+        allure_commons.plugin_manager.unregister(artifacts)
+    monitor = config.stash.get(health_key, None)
+    if monitor:
+        monitor.stop()
 
-    if not os.path.exists(chromedriver_path):
-        pytest.fail(f"ChromeDriver не найден: {chromedriver_path}")
 
-    if not os.path.exists(chrome_binary_path):
-        pytest.fail(f"Тестовый Chrome не найден: {chrome_binary_path}")
+def _health_targets(item, monitor):
+    """Хосты, от которых зависит тест (проверка начинается при первом таком тесте)"""
+    config = item.config
+    targets = []
+    if "driver" in item.fixturenames or "static_client" in item.fixturenames:
+        targets.append(monitor.watch(
+            "site", os.getenv("BASE_URL", "https://www.kinopoisk.ru")))
+    api_url = os.getenv("API_BASE_URL")
+    if ("api_client" in item.fixturenames and api_url
+            and config.getoption("--api-mode") == "live"
+            and not config.getoption("--fake-api")):
+        # HEAD без ключа не расходует квоту API
+        targets.append(monitor.watch("api", api_url, method="HEAD"))
+    return targets
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """Шаги, начатые дальше, относятся к этому тесту; недоступный хост - сразу skip/fail"""
+    get_step_timer().current_test = item.nodeid
+    profiler = item.config.stash.get(profiler_key, None)
+    if profiler:
+        profiler.current_test = item.nodeid
+
+    monitor = item.config.stash.get(health_key, None)
+    if monitor is None:
+        return
+    for target in _health_targets(item, monitor):
+        if target.is_open:
+            message = f"⛔ {target.name}: {target.reason}"
+            if item.config.getoption("--on-outage") == "fail":
+                pytest.fail(message, pytrace=False)
+            pytest.skip(message)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Отчеты фаз теста доступны фикстурам как item.rep_setup, rep_call, rep_teardown"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_teardown(item):
+    """Капча в браузере размыкает предохранитель сайта до конца сессии"""
+    monitor = item.config.stash.get(health_key, None)
+    driver = getattr(item, "funcargs", {}).get("driver")
+    if monitor is None or driver is None or "site" not in monitor.targets:
+        return
+    try:
+        current_url = driver.current_url
+    except WebDriverException:
+        return
+    if is_captcha_url(current_url):
+        # Проверка через requests капчу браузера не видит: у профиля свои cookies
+        monitor.targets["site"].trip(f"браузер получил капчу ({current_url})")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Собрать замеры шагов и профиль команд с воркера pytest-xdist"""
+    output = getattr(node, "workeroutput", {})
+    get_step_timer().records.extend(output.get("step_timings", []))
+    profiler = node.config.stash.get(profiler_key, None)
+    if profiler and "webdriver_profile" in output:
+        profiler.merge(output["webdriver_profile"])
+    browser_reset = node.config.stash.get(browser_reset_key, None)
+    if browser_reset:
+        browser_reset.durations.extend(output.get("browser_reset_durations", []))
+    watchdog = node.config.stash.get(memory_watchdog_key, None)
+    if watchdog:
+        watchdog.records.extend(output.get("browser_memory", []))
+        watchdog.restarts += output.get("browser_restarts", 0)
+
+
+def _launch_browser(pytestconfig, test_profile_dir):
+    """Запустить Chrome с профилем тестов и подключить слушатели команд"""
 
     driver_instance = None
     try:
-        service = Service(chromedriver_path)
+        timer = StartupTimer()
+        timer.start()
 
+        # Chrome и chromedriver для текущей ОС (пути кэшируются в drivers/)
         options = Options()
-        options.binary_location = chrome_binary_path
+        try:
+            chromedriver_path = DriverProvisioner(DRIVERS_DIR).provision(options)
+        except Exception as e:
+            pytest.fail(f"Не удалось подготовить Chrome и ChromeDriver: {e}")
+        service = Service(chromedriver_path)
+        timer.mark("resolve_seconds")
 
-        # Нормальный профиль БЕЗ инкогнито
-        test_profile_dir = os.path.join(project_root, "chrome_test_profile")
+        # Нормальный профиль БЕЗ инкогнито (у воркеров xdist - клон)
         options.add_argument(f"--user-data-dir={test_profile_dir}")
 
         # Обычный User Agent
@@ -49,27 +329,63 @@ def driver():
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
 
-        # Разрешаем изображения
+        # headless=new и опции для Linux раннеров
+        apply_host_arguments(options)
+
+        # Разрешаем изображения (блокировка - через BLOCK_IMAGES политики ресурсов)
         prefs = {'profile.default_content_setting_values': {'images': 1}}
         options.add_experimental_option("prefs", prefs)
 
+        # Стратегия загрузки страницы и лог сети для политики ресурсов
+        resource_policy = ResourcePolicy.from_env()
+        resource_policy.apply_options(options)
+
         print("🚀 ЗАПУСК БРАУЗЕРА ДЛЯ ВСЕХ ТЕСТОВ...")
         driver_instance = webdriver.Chrome(service=service, options=options)
+        timer.mark("launch_seconds")
 
         # Скрываем автоматизацию
         driver_instance.execute_script("Object.defineProperty("
                                        "navigator, 'webdriver', {get: () => undefined})")
 
-        driver_instance.implicitly_wait(10)
+        # Блокируем рекламу, счетчики и (по настройке) картинки, шрифты, медиа
+        resource_policy.apply(driver_instance)
+
+        # Неявное ожидание выключено: все ожидания явные (BasePage, WebDriverWait)
+        driver_instance.implicitly_wait(0)
         driver_instance.set_page_load_timeout(30)
 
-        print("✅ Браузер запущен для всей сессии тестов!")
+        # Метрики производительности после каждого driver.get (PERF_METRICS=0 - выключить)
+        if os.getenv("PERF_METRICS", "1") == "1":
+            collector = PageMetricsCollector(
+                driver_instance,
+                PerfBudgets.load(pytestconfig.getoption("--perf-budgets")),
+                os.path.join(REPORTS_DIR, "page_metrics.jsonl"))
+            add_command_listener(driver_instance, collector)
+            pytestconfig.stash[page_metrics_key] = collector
+
+        # Снимки DOM для офлайн проверки реестра локаторов
+        if pytestconfig.getoption("--save-snapshots"):
+            recorder = SnapshotRecorder(
+                driver_instance,
+                os.getenv("SNAPSHOTS_DIR", os.path.join(project_root, "snapshots")), PAGES)
+            add_command_listener(driver_instance, recorder)
+            pytestconfig.stash[snapshots_key] = recorder
 
-        yield driver_instance
+        # Профилировщик подключается после настройки, чтобы считать только команды тестов
+        profiler = pytestconfig.stash.get(profiler_key, None)
+        if profiler:
+            add_command_listener(driver_instance, profiler)
 
-        print("🔚 ЗАКРЫТИЕ БРАУЗЕРА ПОСЛЕ ВСЕХ ТЕСТОВ...")
-        driver_instance.quit()
-        print("✅ Браузер закрыт!")
+        print(f"✅ Браузер запущен для всей сессии тестов! "
+              f"(поиск драйвера {timer.timings['resolve_seconds']:.2f} с, "
+              f"запуск Chrome {timer.timings['launch_seconds']:.2f} с)")
+        pytestconfig.stash[startup_timings_key] = timer.timings
+        timer.record(os.path.join(REPORTS_DIR, "browser_startup.jsonl"),
+                     chrome=driver_instance.capabilities.get("browserVersion", ""),
+                     headless=os.getenv("HEADLESS", "0"))
+
+        return driver_instance
 
     except Exception as e:
         if driver_instance:
@@ -77,13 +393,360 @@ def driver():
         pytest.fail(f"Не удалось запустить Chrome: {e}")
 
 
+@pytest.fixture(scope="session")  # ← ИЗМЕНИЛИ НА "session"
+def browser_session(pytestconfig):
+    """
+    Браузер для всей сессии тестов
+
+    При запуске через pytest-xdist (-n N) сессия у каждого воркера своя,
+    поэтому каждый воркер получает отдельный Chrome с клоном профиля.
+    """
+    # Профиль (клон у воркера xdist) готовится один раз: перезапуск продолжает его
+    test_profile_dir = worker_profile_dir(project_root)
+    session = BrowserSession(lambda: _launch_browser(pytestconfig, test_profile_dir))
+    session.start()
+
+    yield session
+
+    print("🔚 ЗАКРЫТИЕ БРАУЗЕРА ПОСЛЕ ВСЕХ ТЕСТОВ...")
+    session.quit()
+    print("✅ Браузер закрыт!")
+
+
+@pytest.fixture
+def driver(request, browser_session):
+    """
+    Драйвер браузера сессии для UI теста
+
+    После теста сторож памяти снимает память браузера; если порог
+    превышен или браузер не отвечает, перед следующим тестом Chrome
+    перезапускается с тем же профилем.
+    """
+    watchdog = request.config.stash.get(memory_watchdog_key, None)
+    if watchdog and watchdog.restart_reason:
+        print(f"♻️ Перезапуск браузера: {watchdog.restart_reason}")
+        browser_session.restart()
+        watchdog.restarted()
+
+    yield browser_session.driver
+
+    if watchdog:
+        record = watchdog.sample(browser_session.driver, request.node.nodeid,
+                                 browser_session.pid)
+        growth = record.get("heap_growth_mb")
+        print(f"🧠 Память браузера: JS heap {record.get('heap_mb', 0):.0f} МБ"
+              f"{f' ({growth:+.1f})' if growth is not None else ''}, "
+              f"процессы Chrome {record.get('rss_mb') or 0:.0f} МБ, "
+              f"DOM узлов {record.get('dom_nodes', 0):.0f}")
+
+
+@pytest.fixture
+def browser_state_reset(request, driver):
+    """Сброс состояния браузера перед UI тестом (--browser-reset)"""
+    browser_reset = request.config.stash.get(browser_reset_key, None)
+    if browser_reset:
+        result = browser_reset(driver)
+        print(f"🧹 Состояние браузера сброшено за {result['seconds'] * 1000:.0f} мс "
+              f"(удалено cookies: {result['cookies_deleted']})")
+    return driver
+
+
+@pytest.fixture(autouse=True)
+def network_report(request):
+    """Отчет о запросах и заблокированных ресурсах для каждого UI теста"""
+    if "driver" not in request.fixturenames:
+        yield
+        return
+
+    # Сброс выполняется до начала замера, чтобы его запросы не попали в отчет
+    driver = request.getfixturevalue("browser_state_reset")
+    # Сбрасываем лог, накопленный до начала теста
+    driver.get_log("performance")
+
+    yield
+
+    stats = network_stats(driver)
+    print(f"🌐 Запросов: {stats['requests']}, заблокировано: {stats['blocked']}, "
+          f"ошибок: {stats['failed']}, передано: {stats['transferred_bytes'] / 1024:.0f} КБ")
+    allure.attach(
+        "\n".join(f"{name}: {value}" for name, value in stats.items()),
+        name="Сетевые запросы", attachment_type=allure.attachment_type.TEXT)
+
+
+@pytest.fixture(autouse=True)
+def page_performance(request):
+    """Проверка бюджетов производительности страниц, открытых UI тестом"""
+    if "driver" not in request.fixturenames:
+        yield
+        return
+
+    # Драйвер создается при первом UI тесте, вместе с ним появляется collector
+    request.getfixturevalue("driver")
+    collector = request.config.stash.get(page_metrics_key, None)
+    if collector is None:
+        yield
+        return
+
+    collector.violations = []
+    collector.current_test = request.node.nodeid
+
+    yield
+
+    if collector.violations and request.config.getoption("--perf-strict"):
+        pytest.fail("Превышены бюджеты производительности:\n" +
+                    "\n".join(collector.violations))
+
+
+@pytest.fixture(autouse=True)
+def dom_snapshot(request):
+    """Снимок страницы в конце UI теста, когда JavaScript уже отрисовал ее (--save-snapshots)"""
+    if "driver" not in request.fixturenames:
+        yield
+        return
+
+    # Драйвер создается при первом UI тесте, вместе с ним появляется recorder
+    request.getfixturevalue("driver")
+    recorder = request.config.stash.get(snapshots_key, None)
+    if recorder is None:
+        yield
+        return
+
+    yield
+
+    recorder.save()
+
+
+@pytest.fixture(autouse=True)
+def failure_artifacts(request):
+    """Скриншот, HTML и лог консоли упавшего UI теста (сжатие и запись - в фоне)"""
+    artifacts = request.config.stash.get(artifacts_key, None)
+    if "driver" not in request.fixturenames or artifacts is None:
+        yield
+        return
+
+    yield
+
+    report = getattr(request.node, "rep_call", None)
+    if report is None or not report.failed:
+        return
+    seconds = artifacts.capture(request.getfixturevalue("driver"), request.node.nodeid)
+    if seconds is None:
+        print("⚠️ Бюджет вложений исчерпан, снимок состояния браузера не сохранен")
+    else:
+        print(f"📸 Снимок состояния браузера за {seconds * 1000:.0f} мс, сжатие - в фоне")
+
+
+@pytest.fixture(scope="session")
+def static_client():
+    """HTTP клиент для проверок статического HTML (тесты с маркером nojs)"""
+    client = StaticClient(pool_size=int(os.getenv("STATIC_POOL_SIZE", 10)),
+                          timeout=float(os.getenv("STATIC_TIMEOUT", 15)))
+
+    yield client
+
+    client.close()
+
+
 @pytest.fixture(scope="session")
-def api_config():
+def fake_api():
+    """Локальный заменитель API Кинопоиска на время сессии"""
+    server = FakeApiServer(
+        films=int(os.getenv("FAKE_API_FILMS", 1000)),
+        latency_ms=float(os.getenv("FAKE_API_LATENCY_MS", 0)),
+        error_rate=float(os.getenv("FAKE_API_ERROR_RATE", 0)),
+        rate_limit=float(os.getenv("FAKE_API_RATE_LIMIT", 0))
+    ).start()
+    print(f"🚀 Заменитель API запущен: {server.base_url}")
+
+    yield server
+
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def api_config(request):
+    base_url = os.getenv("API_BASE_URL")
+    api_key = os.getenv("API_KEY")
+    if request.config.getoption("--fake-api"):
+        base_url = request.getfixturevalue("fake_api").base_url
+        api_key = api_key or "fake-api-key"
+
     return {
-        "base_url": os.getenv("API_BASE_URL"),
-        "api_key": os.getenv("API_KEY"),
+        "base_url": base_url,
+        "api_key": api_key,
         "headers": {
-            "X-API-KEY": os.getenv("API_KEY"),
+            "X-API-KEY": api_key,
             "Content-Type": "application/json"
-        }
+        },
+        "pool_size": int(os.getenv("API_POOL_SIZE", 10)),
+        "timeout": float(os.getenv("API_TIMEOUT", 30)),
+        "mode": request.config.getoption("--api-mode"),
+        "cassette_dir": request.config.getoption("--cassette-dir")
+    }
+
+
+@pytest.fixture(scope="session")
+def api_client(request, api_config):
+    """Клиент API с общим пулом keep-alive соединений на всю сессию"""
+    client = KinopoiskApiClient(
+        api_config["base_url"],
+        headers=api_config["headers"],
+        pool_size=api_config["pool_size"],
+        timeout=api_config["timeout"]
+    )
+    use_cassette(client, api_config["cassette_dir"], api_config["mode"])
+
+    # Кэш только для живых запросов: бенчмарку нужны настоящие задержки
+    cache = None
+    config = request.config
+    if (config.getoption("--api-cache") and api_config["mode"] == "live"
+            and not config.getoption("--benchmark")):
+        cache = use_http_cache(
+            client,
+            os.getenv("API_CACHE_DIR", os.path.join(project_root, ".api_cache")),
+            ttl=float(os.getenv("API_CACHE_TTL", 86400)),
+            max_bytes=int(float(os.getenv("API_CACHE_MAX_MB", 50)) * 1024 * 1024))
+    config.stash[api_cache_key] = cache
+
+    if api_config["mode"] == "live":
+        client.warm_up()
+
+    yield client
+
+    if cache:
+        print(f"💾 Кэш API: {cache.summary()}")
+    client.close()
+
+
+@pytest.fixture(autouse=True)
+def api_cache_bypass(request):
+    """Тесты с маркером no_api_cache всегда обращаются к API"""
+    cache = request.config.stash.get(api_cache_key, None)
+    if cache is None or request.node.get_closest_marker("no_api_cache") is None:
+        yield
+        return
+
+    cache.bypass = True
+    yield
+    cache.bypass = False
+
+
+@pytest.fixture(scope="session")
+def api_crawler(api_client):
+    """Параллельный обход всех страниц списков API"""
+    return PaginatedCrawler(
+        api_client,
+        concurrency=min(int(os.getenv("CRAWLER_CONCURRENCY", 5)), api_client.pool_size),
+        rate=float(os.getenv("CRAWLER_RATE", 10))
+    )
+
+
+@pytest.fixture
+def search_corpus(request):
+    """Корпус названий и файл результатов массовой проверки поиска (--search-corpus)"""
+    corpus = request.config.getoption("--search-corpus")
+    if not corpus:
+        pytest.skip("Корпус названий не задан (--search-corpus)")
+
+    return {
+        "corpus": corpus,
+        "output": os.path.join(REPORTS_DIR, "bulk_search.jsonl"),
+        "min_accuracy": float(os.getenv("SEARCH_MIN_ACCURACY", 0.95)),
+        # Прерванный прогон продолжается с места остановки (0 - начать заново)
+        "resume": os.getenv("SEARCH_RESUME", "1") != "0"
     }
+
+
+@pytest.fixture(scope="session")
+def api_benchmark(request):
+    """Замер задержек API сценариев (многократный в режиме --benchmark)"""
+    config = request.config
+    benchmark = ApiBenchmark(
+        enabled=config.getoption("--benchmark"),
+        rounds=config.getoption("--benchmark-rounds"),
+        warmup=config.getoption("--benchmark-warmup"),
+        baseline_path=config.getoption("--benchmark-baseline"),
+        tolerance=config.getoption("--benchmark-tolerance")
+    )
+
+    yield benchmark
+
+    if config.getoption("--benchmark-save"):
+        benchmark.save_baseline()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Сохранить статистику локаторов, время шагов и профиль команд WebDriver"""
+    ranking = get_selector_ranking()
+    if ranking:
+        ranking.save()
+
+    # Файлы вложений должны быть записаны до генерации отчета
+    artifacts = session.config.stash.get(artifacts_key, None)
+    if artifacts:
+        artifacts.wait()
+
+    timer = get_step_timer()
+    profiler = session.config.stash.get(profiler_key, None)
+    if hasattr(session.config, "workeroutput"):
+        # Воркер xdist передает замеры контроллеру, файлы пишет только он
+        session.config.workeroutput["step_timings"] = timer.records
+        if profiler:
+            session.config.workeroutput["webdriver_profile"] = profiler.to_dict()
+        browser_reset = session.config.stash.get(browser_reset_key, None)
+        if browser_reset:
+            session.config.workeroutput["browser_reset_durations"] = browser_reset.durations
+        watchdog = session.config.stash.get(memory_watchdog_key, None)
+        if watchdog:
+            session.config.workeroutput["browser_memory"] = watchdog.records
+            session.config.workeroutput["browser_restarts"] = watchdog.restarts
+        return
+
+    timer.save(REPORTS_DIR)
+    if profiler and profiler.tests:
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        with open(os.path.join(REPORTS_DIR, "webdriver_profile.json"), "w",
+                  encoding="utf-8") as f:
+            json.dump(profiler.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Время холодного старта браузера, самые медленные шаги и профиль команд"""
+    timings = config.stash.get(startup_timings_key, None)
+    if timings:
+        terminalreporter.write_line(
+            f"Запуск браузера: поиск драйвера {timings['resolve_seconds']:.2f} с, "
+            f"старт Chrome {timings['launch_seconds']:.2f} с")
+
+    browser_reset = config.stash.get(browser_reset_key, None)
+    if browser_reset and browser_reset.durations:
+        durations = browser_reset.durations
+        terminalreporter.write_line(
+            f"Сброс состояния браузера: {len(durations)} раз, в среднем "
+            f"{sum(durations) / len(durations) * 1000:.0f} мс, "
+            f"максимум {max(durations) * 1000:.0f} мс")
+
+    limit = config.getoption("--slowest-steps")
+    slowest = get_step_timer().slowest(limit)
+    if limit and slowest:
+        terminalreporter.write_sep("=", f"самые медленные шаги (топ {limit})")
+        for line in format_slowest(slowest):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(
+            f"Все замеры: {os.path.join(REPORTS_DIR, 'step_timings.json')} (и .csv)")
+
+    watchdog = config.stash.get(memory_watchdog_key, None)
+    if watchdog and watchdog.records:
+        terminalreporter.write_sep("=", "память браузера (наибольший прирост JS heap)")
+        for line in watchdog.format():
+            terminalreporter.write_line(line)
+
+    artifacts = config.stash.get(artifacts_key, None)
+    if artifacts and (artifacts.saved or artifacts.skipped):
+        terminalreporter.write_line(f"Вложения упавших тестов: {artifacts.summary()}")
+
+    profiler = config.stash.get(profiler_key, None)
+    if profiler and profiler.tests:
+        terminalreporter.write_sep("=", "команды WebDriver")
+        for line in profiler.format():
+            terminalreporter.write_line(line)
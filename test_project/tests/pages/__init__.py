@@ -1,6 +1,9 @@
 # Этот файл делает директорию pages Python пакетом
 from .base_page import BasePage
+from .locators import LOCATORS, PAGES, Locator, fallbacks, primary
 from .main_page import MainPage
 from .search_page import SearchPage
+from .static_page import StaticClient, StaticPage
 
-__all__ = ['BasePage', 'MainPage', 'SearchPage']
+__all__ = ['BasePage', 'LOCATORS', 'Locator', 'MainPage', 'PAGES', 'SearchPage',
+           'StaticClient', 'StaticPage', 'fallbacks', 'primary']
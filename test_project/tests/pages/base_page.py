@@ -1,8 +1,187 @@
 from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, JavascriptException
+from .locators import fallbacks
+from .selector_ranking import get_selector_ranking
+from utils.timing import record_wait
 import allure
 import os
+import time
+import weakref
+
+
+# Все элементы по CSS или XPath запросу (null при некорректном запросе)
+QUERY_FUNCTION = """
+function queryAll(kind, query) {
+    var nodes = [];
+    try {
+        if (kind === 'xpath') {
+            var snapshot = document.evaluate(query, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var j = 0; j < snapshot.snapshotLength; j++) {
+                if (snapshot.snapshotItem(j).nodeType === 1) {
+                    nodes.push(snapshot.snapshotItem(j));
+                }
+            }
+        } else {
+            nodes = Array.prototype.slice.call(document.querySelectorAll(query));
+        }
+    } catch (e) {
+        return null;
+    }
+    return nodes;
+}
+"""
+
+# Функция проверяет все кандидаты за один вызов и возвращает
+# [индекс победившего локатора, элемент] либо null
+FIND_FUNCTION = QUERY_FUNCTION + """
+function findFirst(candidates, condition) {
+    function isVisible(el) {
+        var style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') {
+            return false;
+        }
+        return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    }
+
+    function matches(el) {
+        if (condition === 'visible') {
+            return isVisible(el);
+        }
+        if (condition === 'clickable') {
+            return isVisible(el) && !el.disabled;
+        }
+        return true;
+    }
+
+    for (var i = 0; i < candidates.length; i++) {
+        var nodes = queryAll(candidates[i][0], candidates[i][1]) || [];
+        for (var k = 0; k < nodes.length; k++) {
+            if (matches(nodes[k])) {
+                return [i, nodes[k]];
+            }
+        }
+    }
+    return null;
+}
+"""
+
+# Одна проверка без ожидания (движок "poll" вызывает ее в цикле)
+FIND_FIRST_SCRIPT = FIND_FUNCTION + """
+return findFirst(arguments[0], arguments[1]);
+"""
+
+# Асинхронное ожидание: проверка при каждом изменении DOM (MutationObserver)
+# и по таймеру poll - для изменений, которые не видны наблюдателю (стили,
+# анимации). Скрипт сам завершается по своему таймауту с результатом null.
+WAIT_SCRIPT = FIND_FUNCTION + """
+var candidates = arguments[0], condition = arguments[1];
+var timeout = arguments[2], poll = arguments[3];
+var done = arguments[arguments.length - 1];
+var finished = false, scheduled = false, observer = null, timer = null, deadline = null;
+
+function finish(result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    clearInterval(timer);
+    clearTimeout(deadline);
+    done(result);
+}
+
+function check() {
+    scheduled = false;
+    var result = findFirst(candidates, condition);
+    if (result) {
+        finish(result);
+    }
+}
+
+function schedule() {
+    // Пачка мутаций проверяется один раз
+    if (!scheduled) {
+        scheduled = true;
+        Promise.resolve().then(check);
+    }
+}
+
+check();
+if (!finished) {
+    observer = new MutationObserver(schedule);
+    observer.observe(document, {childList: true, subtree: true, attributes: true});
+    timer = setInterval(check, poll);
+    deadline = setTimeout(function () { finish(null); }, timeout);
+}
+"""
+
+# Выгрузка полей всех найденных элементов одним вызовом:
+# text - видимый текст, href - абсолютная ссылка, element - сам элемент,
+# любое другое имя - значение атрибута
+EXTRACT_SCRIPT = QUERY_FUNCTION + """
+var nodes = queryAll(arguments[0], arguments[1]) || [], fields = arguments[2];
+return nodes.map(function (el) {
+    var row = {};
+    fields.forEach(function (field) {
+        if (field === 'text') {
+            row.text = (el.innerText || el.textContent || '').trim();
+        } else if (field === 'href') {
+            row.href = el.href || el.getAttribute('href');
+        } else if (field === 'element') {
+            row.element = el;
+        } else {
+            row[field] = el.getAttribute(field);
+        }
+    });
+    return row;
+});
+"""
+
+COUNT_SCRIPT = QUERY_FUNCTION + """
+var nodes = queryAll(arguments[0], arguments[1]);
+return nodes ? nodes.length : 0;
+"""
+
+WAIT_ENGINES = ("observer", "poll")
+# Запас таймаута скрипта WebDriver сверх собственного таймаута ожидания
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# Драйверы, у которых неявное ожидание уже отключено
+_drivers_without_implicit_wait = weakref.WeakSet()
+
+FIND_CONDITIONS = ("presence", "visible", "clickable")
+
+
+def to_browser_locator(locator) -> tuple:
+    """
+    Привести локатор к виду ('css'|'xpath', запрос) для браузерного скрипта
+
+    Args:
+        locator: Строка (XPath начинается с '//' или '(') или кортеж (By, value)
+    """
+    if isinstance(locator, str):
+        if locator.startswith(("/", "(")):
+            return "xpath", locator
+        return "css", locator
+
+    by, value = locator
+    if by == By.XPATH:
+        return "xpath", value
+    if by == By.CSS_SELECTOR:
+        return "css", value
+    if by == By.ID:
+        return "css", f'[id="{value}"]'
+    if by == By.NAME:
+        return "css", f'[name="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css", f".{value}"
+    if by == By.TAG_NAME:
+        return "css", value
+    raise ValueError(f"Локатор {locator} не поддерживается в find_first")
 
 
 class BasePage:
@@ -11,7 +190,70 @@ class BasePage:
     def __init__(self, driver):
         self.driver = driver
         self.base_url = os.getenv("BASE_URL")
-        self.wait = WebDriverWait(driver, int(os.getenv("IMPLICIT_WAIT", 10)))
+        self.timeout = int(os.getenv("IMPLICIT_WAIT", 10))
+        self.poll_interval = int(os.getenv("WAIT_POLL_INTERVAL", 100))
+        self.wait_engine = os.getenv("WAIT_ENGINE", "observer")
+        if self.wait_engine not in WAIT_ENGINES:
+            raise ValueError(f"Неизвестный движок ожидания: {self.wait_engine}")
+        self.wait = WebDriverWait(driver, self.timeout)
+
+        # Неявное ожидание складывается с явным и растягивает негативные
+        # проверки, поэтому движок ожидания работает только с ним выключенным
+        if driver not in _drivers_without_implicit_wait:
+            driver.implicitly_wait(0)
+            _drivers_without_implicit_wait.add(driver)
+
+    def _wait_for(self, candidates: list, condition: str, timeout: float,
+                  message: str) -> list:
+        """
+        Дождаться первого подходящего кандидата
+
+        Args:
+            candidates: Кандидаты в виде [('css'|'xpath', запрос), ...]
+            condition: Условие 'presence', 'visible' или 'clickable'
+            timeout: Таймаут в секундах
+            message: Текст TimeoutException
+
+        Returns:
+            [индекс кандидата, элемент]
+        """
+        started = time.perf_counter()
+        try:
+            return self._run_wait_engine(candidates, condition, timeout, message)
+        finally:
+            # Время ожидания попадает в замер текущих шагов Allure
+            record_wait(time.perf_counter() - started)
+
+    def _run_wait_engine(self, candidates: list, condition: str, timeout: float,
+                         message: str) -> list:
+        """Ожидание выбранным движком (observer или poll)"""
+        if self.wait_engine == "poll":
+            wait = WebDriverWait(self.driver, timeout,
+                                 poll_frequency=self.poll_interval / 1000)
+            return wait.until(lambda driver: driver.execute_script(
+                FIND_FIRST_SCRIPT, candidates, condition), message=message)
+
+        deadline = time.monotonic() + timeout
+        # Таймаут скриптов общий для драйвера и может быть изменен другим кодом
+        # (другой page object, перезапуск браузера), поэтому читается при каждом ожидании
+        script_timeout = self.driver.timeouts.script
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            if script_timeout < remaining + SCRIPT_TIMEOUT_MARGIN:
+                script_timeout = timeout + SCRIPT_TIMEOUT_MARGIN
+                self.driver.set_script_timeout(script_timeout)
+            try:
+                result = self.driver.execute_async_script(
+                    WAIT_SCRIPT, candidates, condition, int(remaining * 1000),
+                    self.poll_interval)
+            except JavascriptException:
+                # Страница перезагрузилась во время ожидания - ждем на новой
+                time.sleep(self.poll_interval / 1000)
+                continue
+            if result:
+                return result
 
     @allure.step("Открыть страницу {url}")
     def open(self, url: str) -> None:
@@ -21,9 +263,63 @@ class BasePage:
     @allure.step("Найти элемент {locator}")
     def find_element(self, locator: tuple, timeout: int = None) -> object:
         """Найти элемент на странице"""
-        wait = WebDriverWait(self.driver, timeout or int(os.getenv(
-            "IMPLICIT_WAIT", 10)))
-        return wait.until(EC.presence_of_element_located(locator))
+        _, element = self._wait_for(
+            [list(to_browser_locator(locator))], "presence",
+            timeout or self.timeout, f"Элемент не найден: {locator}")
+        return element
+
+    @allure.step("Найти первый подходящий элемент из {locators}")
+    def find_first(self, locators: list, condition: str = "presence",
+                   timeout: int = None, name: str = None) -> tuple:
+        """
+        Найти первый элемент из списка запасных локаторов
+
+        Все CSS и XPath кандидаты проверяются одним скриптом в браузере,
+        который ждет изменений DOM, поэтому весь список делит один общий
+        таймаут и поиск завершается сразу после появления любого кандидата.
+
+        Args:
+            locators: Список локаторов в порядке приоритета
+            condition: Условие 'presence', 'visible' или 'clickable'
+            timeout: Общий таймаут ожидания для всего списка
+            name: Логическое имя элемента; если задано, кандидаты
+                упорядочиваются по статистике прошлых запусков
+
+        Returns:
+            Кортеж (элемент, сработавший локатор)
+        """
+        if condition not in FIND_CONDITIONS:
+            raise ValueError(f"Неизвестное условие ожидания: {condition}")
+
+        ranking = get_selector_ranking() if name else None
+        if ranking:
+            locators = ranking.rank(name, locators)
+
+        candidates = [list(to_browser_locator(locator)) for locator in locators]
+        started = time.monotonic()
+        try:
+            index, element = self._wait_for(
+                candidates, condition, timeout or self.timeout,
+                f"Ни один локатор не найден: {locators}")
+        except TimeoutException:
+            if ranking:
+                ranking.record(name, locators)
+            raise
+
+        if ranking:
+            ranking.record(name, locators[:index], locators[index],
+                           time.monotonic() - started)
+        return element, locators[index]
+
+    def find_named(self, name: str, condition: str = "presence",
+                   timeout: int = None) -> tuple:
+        """
+        Найти элемент по логическому имени из реестра локаторов
+
+        Returns:
+            Кортеж (элемент, сработавший локатор)
+        """
+        return self.find_first(fallbacks(name), condition, timeout, name)
 
     @allure.step("Кликнуть на элемент {locator}")
     def click_element(self, locator: tuple) -> None:
@@ -71,3 +367,24 @@ class BasePage:
     def find_elements(self, locator: tuple) -> list:
         """Найти все элементы по локатору"""
         return self.driver.find_elements(*locator)
+
+    @allure.step("Выгрузить поля {fields} элементов {locator}")
+    def extract(self, locator, fields: list) -> list:
+        """
+        Получить данные всех элементов за один вызов execute_script
+
+        Args:
+            locator: Кортеж (By, value) или строка CSS/XPath
+            fields: 'text', 'href', 'element' или имена атрибутов
+
+        Returns:
+            Список словарей {поле: значение} в порядке элементов на странице
+        """
+        kind, query = to_browser_locator(locator)
+        return self.driver.execute_script(EXTRACT_SCRIPT, kind, query, list(fields))
+
+    @allure.step("Посчитать элементы {locator}")
+    def count(self, locator) -> int:
+        """Количество элементов без передачи самих элементов из браузера"""
+        kind, query = to_browser_locator(locator)
+        return self.driver.execute_script(COUNT_SCRIPT, kind, query)
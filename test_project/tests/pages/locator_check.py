@@ -0,0 +1,174 @@
+"""
+Проверка реестра локаторов без браузера
+
+Каждый локатор из tests/pages/locators.py вычисляется через lxml по
+снимку своей страницы (snapshots/<страница>.html, см. --save-snapshots)
+и получает оценку:
+
+- мертвый: ни одного совпадения в снимке;
+- неоднозначный: несколько совпадений у локатора одиночного элемента;
+- медленный: XPath с полным обходом документа ('//*', contains(text())
+  во вложенном '//') или длинный позиционный путь, а также локаторы,
+  вычисление которых по снимку дольше порога.
+
+Мертвые запасные локаторы перед живым стоят каждому поиску лишних
+проверок, поэтому для элемента показывается и позиция первого живого.
+
+Запуск из каталога test_project:
+    python -m tests.pages.locator_check [--snapshots DIR] [--strict]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional
+from lxml import etree
+from .locators import LOCATORS, Locator
+from .static_page import StaticPage
+
+
+SNAPSHOTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "snapshots")
+
+# Позиционные шаги вида /div[2] подряд - путь привязан к верстке
+POSITIONAL_STEPS = re.compile(r"(/[\w*-]+\[\d+\]){3,}")
+
+
+def slow_reason(locator: str) -> Optional[str]:
+    """Причина, по которой локатор дорогой или хрупкий; None - все в порядке"""
+    if not locator.startswith(("/", "(")):
+        return None
+    if POSITIONAL_STEPS.search(locator) or locator.count("/") >= 8:
+        return "длинный позиционный путь привязан к верстке"
+    if locator.startswith("//*"):
+        return "'//*' обходит все элементы документа"
+    if "contains(text()" in locator and locator.count("//") > 1:
+        return "contains(text()) во вложенном поиске '//' проверяет текст многих узлов"
+    return None
+
+
+class LocatorReport:
+    """Результат проверки одного логического элемента"""
+
+    def __init__(self, name: str, locator: Locator) -> None:
+        self.name = name
+        self.locator = locator
+        self.snapshot: Optional[str] = None
+        # локатор -> (число совпадений или None при ошибке, миллисекунды)
+        self.matches: Dict[str, tuple] = {}
+        self.issues: List[str] = []
+
+    @property
+    def first_alive(self) -> Optional[int]:
+        for index, candidate in enumerate(self.locator.candidates):
+            if self.matches.get(candidate, (0,))[0]:
+                return index
+        return None
+
+    @property
+    def broken(self) -> bool:
+        """Ни один локатор элемента не находит его в снимке"""
+        return (self.snapshot is not None and not self.locator.dynamic
+                and self.first_alive is None)
+
+
+def check_entry(name: str, locator: Locator, page: Optional[StaticPage],
+                slow_ms: float = 20) -> LocatorReport:
+    """Проверить все запасные локаторы элемента по снимку страницы"""
+    report = LocatorReport(name, locator)
+    for candidate in locator.candidates:
+        reason = slow_reason(candidate)
+        if reason:
+            report.issues.append(f"медленный: {candidate} - {reason}")
+    if page is None:
+        return report
+
+    report.snapshot = page.url
+    for candidate in locator.candidates:
+        started = time.perf_counter()
+        try:
+            found = len(page.find_elements(candidate))
+        except (etree.XPathError, ValueError, SyntaxError) as e:
+            report.matches[candidate] = (None, 0.0)
+            report.issues.append(f"ошибка: {candidate} - {e}")
+            continue
+        elapsed = (time.perf_counter() - started) * 1000
+        report.matches[candidate] = (found, elapsed)
+
+        if found == 0 and not locator.dynamic:
+            report.issues.append(f"мертвый: {candidate}")
+        elif found > 1 and not locator.many:
+            report.issues.append(f"неоднозначный: {candidate} ({found} совпадений)")
+        if elapsed > slow_ms:
+            report.issues.append(f"медленный: {candidate} - {elapsed:.1f} мс по снимку")
+    return report
+
+
+def load_snapshots(directory: str) -> Dict[str, StaticPage]:
+    """Снимки страниц из каталога: имя страницы -> StaticPage"""
+    pages = {}
+    if not os.path.isdir(directory):
+        return pages
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".html"):
+            pages[filename[:-5]] = StaticPage.from_file(os.path.join(directory, filename))
+    return pages
+
+
+def check_registry(directory: str = SNAPSHOTS_DIR, slow_ms: float = 20) -> List[LocatorReport]:
+    """Проверить весь реестр по снимкам из каталога"""
+    pages = load_snapshots(directory)
+    return [check_entry(name, locator, pages.get(locator.page), slow_ms)
+            for name, locator in LOCATORS.items()]
+
+
+def format_reports(reports: List[LocatorReport]) -> str:
+    lines = []
+    for report in reports:
+        if report.snapshot is None:
+            status = f"⚪ нет снимка страницы '{report.locator.page}'"
+        elif report.broken:
+            status = "❌ не найден ни одним локатором"
+        elif report.first_alive:
+            status = (f"⚠️ первый живой локатор - №{report.first_alive + 1} "
+                      f"из {len(report.locator.candidates)}")
+        elif report.issues:
+            status = "⚠️"
+        else:
+            status = "✅"
+        lines.append(f"{report.name}: {status}")
+        lines.extend(f"    {issue}" for issue in report.issues)
+
+    checked = [report for report in reports if report.snapshot is not None]
+    broken = sum(report.broken for report in reports)
+    issues = sum(len(report.issues) for report in reports)
+    lines.append(f"Проверено элементов: {len(checked)} из {len(reports)}, "
+                 f"не найдено: {broken}, замечаний: {issues}")
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Проверка реестра локаторов по сохраненным снимкам страниц")
+    parser.add_argument("--snapshots", default=os.getenv("SNAPSHOTS_DIR", SNAPSHOTS_DIR),
+                        help="Каталог снимков <страница>.html")
+    parser.add_argument("--slow-ms", type=float, default=20,
+                        help="Порог времени вычисления локатора по снимку, мс")
+    parser.add_argument("--strict", action="store_true",
+                        help="Код возврата 1 при любых замечаниях, а не только "
+                             "при ненайденных элементах")
+    args = parser.parse_args(argv)
+
+    reports = check_registry(args.snapshots, args.slow_ms)
+    print(format_reports(reports))
+    if any(report.broken for report in reports):
+        return 1
+    if args.strict and any(report.issues for report in reports):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Реестр локаторов по логическим именам
+
+Каждое имя - элемент на определенной странице и список запасных
+локаторов в порядке приоритета (строка, начинающаяся с '/' или '(' -
+XPath, иначе CSS). Первый локатор используется константами page
+objects, весь список - BasePage.find_named. Реестр проверяется без
+браузера по сохраненным снимкам страниц: python -m tests.pages.locator_check
+"""
+from typing import NamedTuple, Tuple
+from selenium.webdriver.common.by import By
+
+
+# Страницы, для которых сохраняются снимки DOM: имя -> регулярное выражение URL
+PAGES = {
+    # Только корень сайта: /?kp_query=... - это уже результаты поиска
+    "main": r"^https?://[^/?#]+/?$",
+    "search_results": r"kp_query=|/index\.php\?",
+    "genres": r"/lists/categories/movies/\d+/",
+    "top250": r"/lists/movies/top250/",
+    "advanced_search": r"/s/?(\?.*)?$",
+    "film": r"/film/\d+/?",
+}
+
+
+class Locator(NamedTuple):
+    """Логический элемент страницы"""
+
+    page: str
+    candidates: Tuple[str, ...]
+    # Совпадений много (списки), неоднозначность не считается ошибкой
+    many: bool = False
+    # Элемент появляется только после действия (меню, выпадающий список),
+    # поэтому в снимке страницы его может не быть
+    dynamic: bool = False
+
+
+LOCATORS = {
+    # Главная страница
+    "main.search_input": Locator("main", (
+        "input[name='kp_query']",
+        "input[placeholder*='фильм']",
+        "input[type='search']",
+    )),
+    "main.search_button": Locator("main", (
+        "button[type='submit']",
+        ".header-fresh-search-button",
+        ".search-btn",
+        "input[type='submit']",
+        "[data-tid='search_button']",
+    )),
+    "main.advanced_search_button": Locator("main", (
+        "//a[contains(text(), 'расширенный поиск')]",
+    )),
+    "main.movies_menu": Locator("main", ("//a[contains(text(), 'Фильмы')]",)),
+    "main.series_menu": Locator("main", ("//a[contains(text(), 'Сериалы')]",)),
+
+    # Результаты поиска
+    "search.results": Locator("search_results", (
+        ".search_results",
+        ".search-results",
+        "[data-tid*='search']",
+        ".styles_root__tiG8t",
+    )),
+    "search.result_items": Locator("search_results", (".search_results .item",), many=True),
+    "search.film_link": Locator("search_results", (
+        "a[href*='/film/']",
+        ".search_results a",
+        ".name a",
+        ".styles_root__tiG8t a",
+        "//a[contains(text(), 'Интерстеллар') or contains(@title, 'Интерстеллар')]",
+    ), many=True),
+    "search.film_item": Locator("search_results", (".film-item, .movie-item",), many=True),
+    "search.favorite_icon": Locator("search_results", (".favorite-icon, .bookmark-icon",),
+                                    many=True),
+    "search.three_dots_menu": Locator("search_results", (".context-menu, .dropdown-toggle",),
+                                      many=True),
+    "search.add_to_favorites": Locator("search_results", (
+        "//a[contains(text(), 'Любимые фильмы')]",), dynamic=True),
+
+    # Списки и жанры
+    "genres.fantasy": Locator("genres", (
+        "//a[contains(text(), 'фантастика') or contains(text(), 'Фантастика')]",
+        "//*[@id='__next']/div[1]/div[2]/div[4]/div[2]/div/a[4]/div[1]",
+    )),
+    "genres.filter": Locator("genres", ("//a[contains(text(), 'Жанры')]",)),
+    "genres.best_20_films": Locator("genres", (
+        "//a[contains(text(), 'лучшие 20') or contains(text(), 'Лучшие 20')]",)),
+    "lists.film_link": Locator("top250", ("a[href*='/film/']",), many=True),
+    "lists.sort_dropdown": Locator("top250", ("select[name='sort']",)),
+    "lists.sort_by_rating": Locator("top250", ("//option[contains(text(), 'рейтингу')]",),
+                                    dynamic=True),
+    "lists.sort_by_name": Locator("top250", ("//option[contains(text(), 'названию')]",),
+                                  dynamic=True),
+
+    # Расширенный поиск
+    "advanced.country_select": Locator("advanced_search", ("select[name='country']",)),
+    "advanced.genre_select": Locator("advanced_search", ("select[name='genre']",)),
+    "advanced.title_input": Locator("advanced_search", (
+        "input[name='film_name']",
+        "input[name='kp_query']",
+        "input[type='text']",
+        "input[placeholder*='фильм']",
+        "input[placeholder*='названи']",
+        "input[name*='name']",
+        "input[name*='title']",
+        ".header-fresh-search-input",
+        "[data-tid='search_input']",
+        "#find_film",
+        ".textfield__input",
+        "//input[contains(@placeholder, 'названи')]",
+        "//input[contains(@name, 'name')]",
+        "//input[contains(@class, 'textfield')]",
+    )),
+    "advanced.year_input": Locator("advanced_search", (
+        "input[name='year']",
+        "input[name*='year']",
+        "input[placeholder*='год']",
+        "input[type='number']",
+        "#year",
+        "input[name*='m_act[year]']",
+        "//input[contains(@placeholder, 'год')]",
+        "//input[contains(@name, 'year')]",
+        "//input[@type='number']",
+    )),
+    "advanced.search_button": Locator("advanced_search", (
+        "button[type='submit']",
+        "[type='submit']",
+        "//input[@type='submit']",
+        ".header-fresh-search-button",
+        ".search-btn",
+        "//button[contains(text(), 'Найти')]",
+        "//span[contains(text(), 'Найти')]",
+    )),
+    "advanced.results": Locator("search_results", (
+        ".search_results",
+        ".styles_root__tiG8t",
+        "[data-tid*='search']",
+        ".content",
+        "a[href*='/film/']",
+    )),
+
+    # Страница фильма
+    "film.favorite_button": Locator("film", ("[data-test-id='favorite-button']",)),
+}
+
+
+def fallbacks(name: str) -> list:
+    """Запасные локаторы элемента в порядке приоритета"""
+    return list(LOCATORS[name].candidates)
+
+
+def primary(name: str) -> tuple:
+    """Основной локатор элемента в виде (By, value) для констант page objects"""
+    value = LOCATORS[name].candidates[0]
+    if value.startswith(("/", "(")):
+        return By.XPATH, value
+    return By.CSS_SELECTOR, value
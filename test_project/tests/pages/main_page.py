@@ -1,19 +1,18 @@
 from .base_page import BasePage
-from selenium.webdriver.common.by import By
+from .locators import primary
 import allure
 
 
 class MainPage(BasePage):
     """Класс для работы с главной страницей Кинопоиска"""
 
-    # Локаторы
-    SEARCH_INPUT = (By.CSS_SELECTOR, "input[name='kp_query']")
-    SEARCH_BUTTON = (By.CSS_SELECTOR, "button[type='submit']")
-    ADVANCED_SEARCH_BUTTON = (By.XPATH, "//a[contains(text(), "
-                                        "'расширенный поиск')]")
-    MOVIES_MENU = (By.XPATH, "//a[contains(text(), 'Фильмы')]")
-    SERIES_MENU = (By.XPATH, "//a[contains(text(), 'Сериалы')]")
-    FAVORITE_BUTTON = (By.CSS_SELECTOR, "[data-test-id='favorite-button']")
+    # Локаторы (реестр tests/pages/locators.py)
+    SEARCH_INPUT = primary("main.search_input")
+    SEARCH_BUTTON = primary("main.search_button")
+    ADVANCED_SEARCH_BUTTON = primary("main.advanced_search_button")
+    MOVIES_MENU = primary("main.movies_menu")
+    SERIES_MENU = primary("main.series_menu")
+    FAVORITE_BUTTON = primary("film.favorite_button")
 
     def __init__(self, driver):
         super().__init__(driver)
@@ -1,4 +1,5 @@
 from .base_page import BasePage
+from .locators import primary
 from selenium.webdriver.common.by import By
 import allure
 
@@ -6,29 +7,28 @@ import allure
 class SearchPage(BasePage):
     """Класс для работы со страницей поиска и расширенного поиска"""
 
-    # Локаторы для расширенного поиска
-    FILM_NAME_INPUT = (By.CSS_SELECTOR, "input[name='film_name']")
-    YEAR_INPUT = (By.CSS_SELECTOR, "input[name='year']")
-    COUNTRY_SELECT = (By.CSS_SELECTOR, "select[name='country']")
-    GENRE_SELECT = (By.CSS_SELECTOR, "select[name='genre']")
-    SEARCH_BUTTON = (By.CSS_SELECTOR, "button[type='submit']")
-    SEARCH_RESULTS = (By.CSS_SELECTOR, ".search_results .item")
+    # Локаторы для расширенного поиска (реестр tests/pages/locators.py)
+    FILM_NAME_INPUT = primary("advanced.title_input")
+    YEAR_INPUT = primary("advanced.year_input")
+    COUNTRY_SELECT = primary("advanced.country_select")
+    GENRE_SELECT = primary("advanced.genre_select")
+    SEARCH_BUTTON = primary("advanced.search_button")
+    SEARCH_RESULTS = primary("search.result_items")
 
     # Локаторы для поиска по жанрам
-    GENRES_FILTER = (By.XPATH, "//a[contains(text(), 'Жанры')]")
-    FANTASY_GENRE = (By.XPATH, "//a[contains(text(), 'фантастика')"
-                               " or contains(text(), 'Фантастика')]")
-    BEST_20_FILMS = (By.XPATH, "//a[contains(text(), 'лучшие 20')"
-                               " or contains(text(), 'Лучшие 20')]")
-    SORT_DROPDOWN = (By.CSS_SELECTOR, "select[name='sort']")
-    SORT_BY_RATING = (By.XPATH, "//option[contains(text(), 'рейтингу')]")
-    SORT_BY_NAME = (By.XPATH, "//option[contains(text(), 'названию')]")
+    GENRES_FILTER = primary("genres.filter")
+    FANTASY_GENRE = primary("genres.fantasy")
+    BEST_20_FILMS = primary("genres.best_20_films")
+    SORT_DROPDOWN = primary("lists.sort_dropdown")
+    SORT_BY_RATING = primary("lists.sort_by_rating")
+    SORT_BY_NAME = primary("lists.sort_by_name")
 
     # Локаторы для результатов поиска
-    FILM_ITEM = (By.CSS_SELECTOR, ".film-item, .movie-item")
-    FAVORITE_ICON = (By.CSS_SELECTOR, ".favorite-icon, .bookmark-icon")
-    THREE_DOTS_MENU = (By.CSS_SELECTOR, ".context-menu, .dropdown-toggle")
-    ADD_TO_FAVORITES = (By.XPATH, "//a[contains(text(), 'Любимые фильмы')]")
+    FILM_LINK = primary("search.film_link")
+    FILM_ITEM = primary("search.film_item")
+    FAVORITE_ICON = primary("search.favorite_icon")
+    THREE_DOTS_MENU = primary("search.three_dots_menu")
+    ADD_TO_FAVORITES = primary("search.add_to_favorites")
 
     def __init__(self, driver):
         super().__init__(driver)
@@ -36,12 +36,16 @@ class SearchPage(BasePage):
     @allure.step("Заполнить поле названия фильма: '{film_name}'")
     def enter_film_name(self, film_name: str) -> None:
         """Ввести название фильма в поле поиска"""
-        self.enter_text(self.FILM_NAME_INPUT, film_name)
+        element, _ = self.find_named("advanced.title_input", "visible")
+        element.clear()
+        element.send_keys(film_name)
 
     @allure.step("Заполнить поле года: '{year}'")
     def enter_year(self, year: str) -> None:
         """Ввести год выпуска фильма"""
-        self.enter_text(self.YEAR_INPUT, year)
+        element, _ = self.find_named("advanced.year_input", "visible")
+        element.clear()
+        element.send_keys(year)
 
     @allure.step("Выбрать страну: '{country}'")
     def select_country(self, country: str) -> None:
@@ -53,12 +57,14 @@ class SearchPage(BasePage):
     @allure.step("Выполнить поиск")
     def perform_search(self) -> None:
         """Нажать кнопку поиска"""
-        self.click_element(self.SEARCH_BUTTON)
+        element, _ = self.find_named("advanced.search_button", "clickable")
+        element.click()
 
     @allure.step("Выбрать жанр 'Фантастика'")
     def select_fantasy_genre(self) -> None:
         """Выбрать жанр фантастика"""
-        self.click_element(self.FANTASY_GENRE)
+        element, _ = self.find_named("genres.fantasy", "clickable")
+        element.click()
 
     @allure.step("Открыть категорию 'Лучшие 20 фильмов'")
     def open_best_20_films(self) -> None:
@@ -97,8 +103,7 @@ class SearchPage(BasePage):
     @allure.step("Получить количество результатов поиска")
     def get_search_results_count(self) -> int:
         """Получить количество найденных фильмов"""
-        results = self.driver.find_elements(*self.SEARCH_RESULTS)
-        return len(results)
+        return self.count(self.SEARCH_RESULTS)
 
     @allure.step("Проверить наличие результатов поиска")
     def has_search_results(self) -> bool:
@@ -0,0 +1,172 @@
+import json
+import os
+import re
+import tempfile
+import time
+
+
+DEFAULT_STATS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    ".selector_stats.json")
+
+# Локатор без признаков конкретного элемента: только тег и/или type
+# ('input', "[type='submit']", "//input[@type='number']"). Такие локаторы
+# находят посторонние элементы страницы, поэтому не переупорядочиваются
+GENERIC_CSS = re.compile(r"^[\w*]*(\[type=['\"]?[\w-]+['\"]?\])?$")
+GENERIC_XPATH = re.compile(r"^//[\w*]+(\[@type=['\"][\w-]+['\"]\])?$")
+
+
+def locator_key(locator) -> str:
+    """Строковый ключ локатора для хранения статистики"""
+    if isinstance(locator, str):
+        return locator
+    by, value = locator
+    return f"{by}={value}"
+
+
+def is_generic(locator) -> bool:
+    """Локатор-заглушка, который может найти не тот элемент"""
+    value = locator if isinstance(locator, str) else locator[1]
+    value = value.strip()
+    return bool(GENERIC_XPATH.match(value) or GENERIC_CSS.match(value))
+
+
+class SelectorRanking:
+    """
+    Хранилище статистики сработавших локаторов
+
+    Для каждого логического элемента запоминает, какой из запасных
+    локаторов сработал, долю успехов и среднюю задержку. При следующем
+    запуске кандидаты переупорядочиваются: исторический победитель
+    проверяется первым. Общие локаторы (is_generic) остаются на своих
+    местах: иначе одна победа заглушки 'input' ставит ее выше точных
+    локаторов, и дальше она находит первое попавшееся поле. Записи
+    старше ttl_days удаляются.
+    """
+
+    def __init__(self, path: str, ttl_days: float = 14):
+        self.path = path
+        self.ttl = ttl_days * 24 * 3600
+        self.stats = self._read()
+        # Изменения текущего процесса, которые вливаются в файл при сохранении
+        self._delta = {}
+
+    def _read(self) -> dict:
+        """Прочитать статистику с диска, отбросив устаревшие записи"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return self._prune(data)
+
+    def _prune(self, data: dict) -> dict:
+        """Удалить записи, которые не обновлялись дольше ttl"""
+        border = time.time() - self.ttl
+        pruned = {}
+        for name, entries in data.items():
+            fresh = {key: entry for key, entry in entries.items()
+                     if entry.get("last_seen", 0) >= border}
+            if fresh:
+                pruned[name] = fresh
+        return pruned
+
+    @staticmethod
+    def _score(entry: dict) -> tuple:
+        """Ключ сортировки: доля успехов (со сглаживанием), затем задержка"""
+        if not entry:
+            return -0.5, float("inf")
+        hits, misses = entry["hits"], entry["misses"]
+        rate = (hits + 1) / (hits + misses + 2)
+        latency = entry["latency"] / hits if hits else float("inf")
+        return -rate, latency
+
+    def rank(self, name: str, locators: list) -> list:
+        """
+        Упорядочить кандидатов по исторической успешности
+
+        Args:
+            name: Логическое имя элемента
+            locators: Кандидаты в исходном порядке
+
+        Returns:
+            Новый список кандидатов; общие локаторы остаются на исходных
+            позициях, при равенстве сохраняется исходный порядок
+        """
+        entries = self.stats.get(name, {})
+        specific = sorted((loc for loc in locators if not is_generic(loc)),
+                          key=lambda loc: self._score(entries.get(locator_key(loc))))
+        ranked = iter(specific)
+        return [loc if is_generic(loc) else next(ranked) for loc in locators]
+
+    def _update(self, storage: dict, name: str, key: str, hit: bool,
+                latency: float, now: float) -> None:
+        entry = storage.setdefault(name, {}).setdefault(
+            key, {"hits": 0, "misses": 0, "latency": 0.0, "last_seen": now})
+        if hit:
+            entry["hits"] += 1
+            entry["latency"] += latency
+        else:
+            entry["misses"] += 1
+        entry["last_seen"] = now
+
+    def record(self, name: str, tried: list, winner=None,
+               latency: float = 0.0) -> None:
+        """
+        Записать результат поиска
+
+        Args:
+            name: Логическое имя элемента
+            tried: Кандидаты, которые проверялись раньше победителя и не сработали
+            winner: Сработавший локатор (None, если истек таймаут)
+            latency: Время до нахождения элемента в секундах
+        """
+        now = time.time()
+        for storage in (self.stats, self._delta):
+            for locator in tried:
+                self._update(storage, name, locator_key(locator), False, 0.0, now)
+            if winner is not None:
+                self._update(storage, name, locator_key(winner), True,
+                             latency, now)
+
+    def save(self) -> None:
+        """Влить накопленные изменения в файл (безопасно для параллельных процессов)"""
+        if not self._delta:
+            return
+        data = self._read()
+        for name, entries in self._delta.items():
+            for key, delta in entries.items():
+                entry = data.setdefault(name, {}).setdefault(
+                    key, {"hits": 0, "misses": 0, "latency": 0.0, "last_seen": 0})
+                entry["hits"] += delta["hits"]
+                entry["misses"] += delta["misses"]
+                entry["latency"] += delta["latency"]
+                entry["last_seen"] = max(entry["last_seen"], delta["last_seen"])
+
+        directory = os.path.dirname(self.path) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._prune(data), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self.stats = self._prune(data)
+        self._delta = {}
+
+
+_ranking = None
+
+
+def get_selector_ranking():
+    """
+    Общее хранилище статистики локаторов для текущего процесса
+
+    Returns:
+        SelectorRanking или None, если ранжирование отключено (SELECTOR_RANKING=0)
+    """
+    global _ranking
+    if os.getenv("SELECTOR_RANKING", "1") == "0":
+        return None
+    if _ranking is None:
+        _ranking = SelectorRanking(
+            os.getenv("SELECTOR_STATS_FILE", DEFAULT_STATS_FILE),
+            float(os.getenv("SELECTOR_STATS_TTL_DAYS", 14)))
+    return _ranking
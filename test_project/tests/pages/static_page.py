@@ -0,0 +1,121 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence
+from urllib.parse import urljoin
+import allure
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from utils.health import is_captcha_url
+from .base_page import to_browser_locator
+
+
+# Тот же User Agent, что и у браузера в conftest.py
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36")
+
+
+class StaticPage:
+    """
+    Страница, разобранная из HTML без браузера
+
+    Понимает те же локаторы, что и BasePage (кортежи By и строки CSS/XPath),
+    но видит только серверную разметку - без работы JavaScript.
+    """
+
+    def __init__(self, url: str, response: requests.Response) -> None:
+        self.url = response.url or url
+        self.status_code = response.status_code
+        self.elapsed = response.elapsed.total_seconds()
+        # Без charset в заголовке requests и lxml считают разметку latin-1
+        charset_given = "charset" in response.headers.get("Content-Type", "").lower()
+        parser = lxml.html.HTMLParser(
+            encoding=response.encoding if charset_given else "utf-8")
+        self.document = lxml.html.fromstring(response.content or b"<html></html>",
+                                             parser=parser, base_url=self.url)
+
+    @classmethod
+    def from_file(cls, path: str) -> "StaticPage":
+        """
+        Страница из сохраненного снимка (utils.snapshots.SnapshotRecorder)
+
+        Адрес берется из комментария в первой строке снимка, если он есть.
+        """
+        with open(path, "rb") as f:
+            content = f.read()
+        first_line = content.split(b"\n", 1)[0].decode("utf-8", "replace")
+        match = re.match(r"<!-- (\S+) -->", first_line)
+        page = cls.__new__(cls)
+        page.url = match.group(1) if match else path
+        page.status_code = 200
+        page.elapsed = 0.0
+        page.document = lxml.html.fromstring(content or b"<html></html>",
+                                             parser=lxml.html.HTMLParser(encoding="utf-8"),
+                                             base_url=page.url)
+        return page
+
+    @property
+    def is_captcha(self) -> bool:
+        """Вместо страницы отдана капча Яндекса"""
+        return is_captcha_url(self.url)
+
+    def find_elements(self, locator) -> list:
+        """Все элементы по локатору"""
+        kind, query = to_browser_locator(locator)
+        if kind == "xpath":
+            return [node for node in self.document.xpath(query)
+                    if isinstance(node, lxml.html.HtmlElement)]
+        return self.document.cssselect(query)
+
+    def count(self, locator) -> int:
+        return len(self.find_elements(locator))
+
+    def extract(self, locator, fields: Sequence[str]) -> List[Dict[str, str]]:
+        """Поля элементов в формате BasePage.extract ('text', 'href', атрибуты)"""
+        rows = []
+        for node in self.find_elements(locator):
+            row = {}
+            for field in fields:
+                if field == "text":
+                    row["text"] = node.text_content().strip()
+                elif field == "href":
+                    href = node.get("href")
+                    row["href"] = urljoin(self.url, href) if href else None
+                elif field == "element":
+                    row["element"] = node
+                else:
+                    row[field] = node.get(field)
+            rows.append(row)
+        return rows
+
+
+class StaticClient:
+    """HTTP клиент с пулом соединений для проверок без JavaScript"""
+
+    def __init__(self, pool_size: int = 10, timeout: float = 15) -> None:
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Language": "ru-RU,ru;q=0.9",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @allure.step("Загрузить HTML страницы {url}")
+    def open(self, url: str) -> StaticPage:
+        response = self.session.get(url, timeout=self.timeout)
+        return StaticPage(url, response)
+
+    @allure.step("Загрузить HTML страниц {urls}")
+    def open_all(self, urls: Sequence[str]) -> List[StaticPage]:
+        """Загрузить несколько страниц параллельно (порядок сохраняется)"""
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(urls) or 1)) as executor:
+            return list(executor.map(
+                lambda url: StaticPage(url, self.session.get(url, timeout=self.timeout)),
+                urls))
+
+    def close(self) -> None:
+        self.session.close()
@@ -1,7 +1,32 @@
+import json
+import os
 import pytest
-import requests
 import allure
-from typing import Dict, Any
+from api.client import KinopoiskApiClient
+from api.benchmark import ApiBenchmark
+from api.bulk_search import BulkSearch, read_corpus
+from api.crawler import (PaginatedCrawler, check_no_duplicates, check_rating_order,
+                         check_rating_range)
+from api.scenarios import SCENARIOS
+
+
+SAMPLE_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "search_corpus.csv")
+
+
+class StubSearchCrawler:
+    """Обходчик без сети: поиск находит фильм корпуса по названию"""
+
+    concurrency = 2
+
+    def __init__(self, corpus_path: str) -> None:
+        self.films = {entry["title"]: entry["film_id"] for entry in read_corpus(corpus_path)}
+        self.keywords = []
+
+    def fetch(self, path: str, params: dict) -> dict:
+        keyword = params["keyword"]
+        self.keywords.append(keyword)
+        return {"films": [{"filmId": self.films[keyword], "nameRu": keyword}]}
 
 
 @allure.epic("Kinopoisk API Tests")
@@ -13,166 +38,257 @@ class TestKinopoiskAPI:
     @allure.title("Поиск фильмов по ключевому слову 'миньоны'")
     @pytest.mark.api
     @pytest.mark.smoke
-    def test_search_films_by_keyword(self, api_config: Dict[str, Any]) -> None:
+    @pytest.mark.no_api_cache
+    def test_search_films_by_keyword(self, api_client: KinopoiskApiClient,
+                                     api_benchmark: ApiBenchmark) -> None:
         """
         Тест поиска фильмов по ключевому слову
 
         Args:
-            api_config: Конфигурация API с базовым URL и заголовками
+            api_client: Клиент API с общим пулом соединений
+            api_benchmark: Замер задержек сценария
         """
-        with allure.step("Отправить GET запрос для поиска по ключевому слову"):
-            url = f"{api_config['base_url']}/api/v2.1/films/search-by-keyword"
-            params = {"keyword": "миньоны"}
+        scenario = SCENARIOS["search_by_keyword"]
 
-            response = requests.get(
-                url,
-                headers=api_config["headers"],
-                params=params
-            )
+        with allure.step("Отправить GET запрос для поиска по ключевому слову"):
+            result = api_benchmark.measure(scenario.name, lambda: scenario.send(api_client))
+            response = result.response
 
         with allure.step("Проверить статус код ответа"):
-            assert response.status_code == 200, (f"Ожидался статус 200, "
-                                                 f"получен {response.status_code}")
+            scenario.check_status(response)
 
         with allure.step("Проверить время ответа"):
-            assert response.elapsed.total_seconds() < 1.1, "Время ответа превышает 1.1 секунды"
+            assert result.stats["p95"] < 1.1, "Время ответа (p95) превышает 1.1 секунды"
+            api_benchmark.assert_no_regression(result)
 
         with allure.step("Проверить структуру ответа"):
-            response_data = response.json()
-            assert "films" in response_data, "В ответе отсутствует ключ 'films'"
-            assert len(response_data["films"]) > 0, "Список фильмов пуст"
-
-            film = response_data["films"][0]
-            assert "filmId" in film, "В фильме отсутствует ID"
-            assert "nameRu" in film or "nameEn" in film, "В фильме отсутствует название"
+            scenario.check_body(response.json())
 
     @allure.story("Позитивные тесты API")
     @allure.title("Поиск фильмов по различным фильтрам")
     @pytest.mark.api
     @pytest.mark.smoke
-    def test_search_films_with_filters(self, api_config: Dict[str, Any]) -> None:
+    def test_search_films_with_filters(self, api_client: KinopoiskApiClient,
+                                       api_benchmark: ApiBenchmark) -> None:
         """
         Тест поиска фильмов с применением фильтров
 
         Args:
-            api_config: Конфигурация API с базовым URL и заголовками
+            api_client: Клиент API с общим пулом соединений
+            api_benchmark: Замер задержек сценария
         """
+        scenario = SCENARIOS["search_with_filters"]
+
         with allure.step("Отправить GET запрос с фильтрами"):
-            url = f"{api_config['base_url']}/api/v2.2/films"
-            params = {
-                "countries": 1,
-                "genres": 11,
-                "order": "RATING",
-                "type": "FILM",
-                "ratingFrom": 7,
-                "ratingTo": 10,
-                "yearFrom": 2020,
-                "yearTo": 2020,
-                "page": 1
-            }
-
-            response = requests.get(
-                url,
-                headers=api_config["headers"],
-                params=params
-            )
+            result = api_benchmark.measure(scenario.name, lambda: scenario.send(api_client))
+            response = result.response
 
         with allure.step("Проверить статус код ответа"):
-            assert response.status_code == 200, f"ОР 200, получен {response.status_code}"
+            scenario.check_status(response)
 
-        with allure.step("Проверить структуру ответа"):
-            response_data = response.json()
-            assert "items" in response_data, "В ответе отсутствует ключ 'items'"
-            assert len(response_data["items"]) > 0, "Список фильмов пуст"
+        with allure.step("Проверить задержку относительно базовой линии"):
+            api_benchmark.assert_no_regression(result)
 
-            film = response_data["items"][0]
-            assert "kinopoiskId" in film, "В фильме отсутствует kinopoiskId"
-            assert "genres" in film, "В фильме отсутствует информация о жанрах"
-            assert "countries" in film, "В фильме отсутствует информация о странах"
+        with allure.step("Проверить структуру ответа"):
+            scenario.check_body(response.json())
 
     @allure.story("Позитивные тесты API")
     @allure.title("Получение топ-250 фильмов")
     @pytest.mark.api
     @pytest.mark.smoke
-    def test_get_top_250_films(self, api_config: Dict[str, Any]) -> None:
+    def test_get_top_250_films(self, api_client: KinopoiskApiClient,
+                               api_benchmark: ApiBenchmark) -> None:
         """
         Тест получения топ-250 фильмов
 
         Args:
-            api_config: Конфигурация API с базовым URL и заголовками
+            api_client: Клиент API с общим пулом соединений
+            api_benchmark: Замер задержек сценария
         """
+        scenario = SCENARIOS["top_250"]
+
         with allure.step("Отправить GET запрос для получения топ-250"):
-            url = f"{api_config['base_url']}/api/v2.2/films/top"
-            params = {
-                "type": "TOP_250_BEST_FILMS",
-                "page": 1
-            }
-
-            response = requests.get(
-                url,
-                headers=api_config["headers"],
-                params=params
-            )
+            result = api_benchmark.measure(scenario.name, lambda: scenario.send(api_client))
+            response = result.response
 
         with allure.step("Проверить статус код ответа"):
-            assert response.status_code == 200, f"ОР 200, получен {response.status_code}"
+            scenario.check_status(response)
+
+        with allure.step("Проверить задержку относительно базовой линии"):
+            api_benchmark.assert_no_regression(result)
 
         with allure.step("Проверить структуру ответа"):
-            response_data = response.json()
-            assert "films" in response_data, "В ответе отсутствует ключ 'films'"
-            assert len(response_data["films"]) > 0, "Список фильмов пуст"
+            scenario.check_body(response.json())
+
+    @allure.story("Полные списки API")
+    @allure.title("Все страницы топ-250 фильмов")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_top_250_full_listing(self, api_crawler: PaginatedCrawler) -> None:
+        """
+        Тест всего топ-250: без повторов и по убыванию рейтинга
+
+        Args:
+            api_crawler: Параллельный обход страниц с ограничением частоты
+        """
+        with allure.step("Загрузить все страницы топ-250"):
+            result = api_crawler.crawl_top("TOP_250_BEST_FILMS")
+            print(f"✅ Топ-250: {result.summary()}")
+
+        with allure.step("Проверить размер и отсутствие повторов"):
+            assert len(result.items) == 250, f"В топе {len(result.items)} фильмов вместо 250"
+            check_no_duplicates(result.items, "filmId")
+
+        with allure.step("Проверить порядок по рейтингу"):
+            check_rating_order(result.items, "rating")
+
+    @allure.story("Полные списки API")
+    @allure.title("Все страницы поиска по фильтрам")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_filtered_full_listing(self, api_crawler: PaginatedCrawler) -> None:
+        """
+        Тест всех страниц /api/v2.2/films с order=RATING и диапазоном рейтинга
+
+        Args:
+            api_crawler: Параллельный обход страниц с ограничением частоты
+        """
+        rating_from, rating_to = 7, 10
+
+        with allure.step("Загрузить все страницы поиска по фильтрам"):
+            result = api_crawler.crawl_films(order="RATING", type="FILM",
+                                             ratingFrom=rating_from, ratingTo=rating_to)
+            print(f"✅ Поиск по фильтрам: {result.summary()}")
+
+        with allure.step("Проверить отсутствие повторов"):
+            assert result.items, "Список фильмов пуст"
+            check_no_duplicates(result.items, "kinopoiskId")
+
+        with allure.step("Проверить порядок и диапазон рейтинга"):
+            check_rating_order(result.items, "ratingKinopoisk")
+            check_rating_range(result.items, "ratingKinopoisk", "kinopoiskId",
+                               rating_from, rating_to)
+
+    @allure.story("Позитивные тесты API")
+    @allure.title("Массовая проверка поиска по корпусу названий")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_bulk_search_corpus(self, api_crawler: PaginatedCrawler,
+                                search_corpus: dict) -> None:
+        """
+        Тест поиска каждого названия корпуса: ожидаемый filmId и название
+
+        Args:
+            api_crawler: Параллельный обход с ограничением частоты
+            search_corpus: Корпус, файл результатов и минимальная точность
+        """
+        with allure.step("Проверить все названия корпуса"):
+            report = BulkSearch(api_crawler).run(
+                search_corpus["corpus"], search_corpus["output"],
+                resume=search_corpus["resume"])
+            print(f"✅ Массовый поиск: {report.summary()}")
+            allure.attach(report.summary(), name="Итоги массового поиска",
+                          attachment_type=allure.attachment_type.TEXT)
+
+        with allure.step("Проверить ошибки и точность поиска"):
+            assert report.total, "Корпус названий пуст"
+            assert not report.statuses["error"], \
+                f"Запросы завершились ошибкой: {report.failures[:5]}"
+            assert report.accuracy >= search_corpus["min_accuracy"], \
+                (f"Точность поиска {report.accuracy:.1%} ниже "
+                 f"{search_corpus['min_accuracy']:.0%}: {report.failures[:5]}")
+
+    @allure.story("Позитивные тесты API")
+    @allure.title("Продолжение прерванной массовой проверки поиска")
+    @pytest.mark.api
+    @pytest.mark.regression
+    def test_bulk_search_resume(self, tmp_path) -> None:
+        """
+        Тест продолжения массовой проверки: без повторов и пропусков названий
+
+        Запросы отдает заглушка обходчика, поэтому тест не тратит квоту API.
+
+        Args:
+            tmp_path: Каталог файла результатов
+        """
+        output = str(tmp_path / "bulk_search.jsonl")
+        titles = [entry["title"] for entry in read_corpus(SAMPLE_CORPUS)]
+        crawler = StubSearchCrawler(SAMPLE_CORPUS)
+        bulk_search = BulkSearch(crawler)
+
+        with allure.step("Прервать проверку после первых названий"):
+            first = bulk_search.run(SAMPLE_CORPUS, output, limit=4, progress_every=0)
+            assert first.checked == 4, f"Проверено {first.checked} названий вместо 4"
+            # Запуск оборвался во время записи строки
+            with open(output, "a", encoding="utf-8") as f:
+                f.write('{"title": "недописанная')
 
-            film = response_data["films"][0]
-            assert "filmId" in film, "В фильме отсутствует filmId"
-            assert "rating" in film, "В фильме отсутствует рейтинг"
+        with allure.step("Продолжить проверку с места остановки"):
+            report = bulk_search.run(SAMPLE_CORPUS, output, progress_every=0)
+            print(f"✅ Продолжение: {report.summary()}")
+            assert report.resumed == 4, f"Продолжено с {report.resumed} вместо 4"
+            assert report.checked == len(titles) - 4, \
+                f"Во втором запуске проверено {report.checked} названий"
+
+        with allure.step("Проверить, что каждое название проверено ровно один раз"):
+            with open(output, encoding="utf-8") as f:
+                checked = [json.loads(line)["title"] for line in f]
+            assert checked == titles, f"Результаты не совпадают с корпусом: {checked}"
+            assert sorted(crawler.keywords) == sorted(titles), \
+                f"Названия запрошены не по одному разу: {crawler.keywords}"
 
     @allure.story("Негативные тесты API")
     @allure.title("Запрос без API-ключа")
     @pytest.mark.api
     @pytest.mark.regression
-    def test_request_without_api_key(self, api_config: Dict[str, Any]) -> None:
+    def test_request_without_api_key(self, api_client: KinopoiskApiClient,
+                                     api_benchmark: ApiBenchmark) -> None:
         """
         Тест запроса без API ключа
 
         Args:
-            api_config: Конфигурация API с базовым URL и заголовками
+            api_client: Клиент API с общим пулом соединений
+            api_benchmark: Замер задержек сценария
         """
-        with allure.step("Отправить GET запрос без API ключа"):
-            url = f"{api_config['base_url']}/api/v2.2/films/252002"
+        scenario = SCENARIOS["without_api_key"]
 
-            response = requests.get(url)
+        with allure.step("Отправить GET запрос без API ключа"):
+            result = api_benchmark.measure(scenario.name, lambda: scenario.send(api_client))
+            response = result.response
 
         with allure.step("Проверить статус код 401"):
-            assert response.status_code == 401, f"ОР 401, получен {response.status_code}"
+            scenario.check_status(response)
+
+        with allure.step("Проверить задержку относительно базовой линии"):
+            api_benchmark.assert_no_regression(result)
 
         with allure.step("Проверить сообщение об ошибке"):
-            response_data = response.json()
-            assert "message" in response_data, "В ответе отсутствует сообщение об ошибке"
+            scenario.check_body(response.json())
 
     @allure.story("Негативные тесты API")
     @allure.title("Запрос несуществующего фильма")
     @pytest.mark.api
     @pytest.mark.regression
-    def test_request_nonexistent_film(self, api_config: Dict[str, Any]) -> None:
+    def test_request_nonexistent_film(self, api_client: KinopoiskApiClient,
+                                      api_benchmark: ApiBenchmark) -> None:
         """
         Тест запроса несуществующего фильма
 
         Args:
-            api_config: Конфигурация API с базовым URL и заголовками
+            api_client: Клиент API с общим пулом соединений
+            api_benchmark: Замер задержек сценария
         """
-        with allure.step("Отправить GET запрос для несуществующего фильма"):
-            url = f"{api_config['base_url']}/api/v2.2/films/29999999999"
+        scenario = SCENARIOS["nonexistent_film"]
 
-            response = requests.get(
-                url,
-                headers=api_config["headers"]
-            )
+        with allure.step("Отправить GET запрос для несуществующего фильма"):
+            result = api_benchmark.measure(scenario.name, lambda: scenario.send(api_client))
+            response = result.response
 
         with allure.step("Проверить статус код 400"):
-            assert response.status_code == 400, (f"Ожидался статус 400, "
-                                                 f"получен {response.status_code}")
+            scenario.check_status(response)
+
+        with allure.step("Проверить задержку относительно базовой линии"):
+            api_benchmark.assert_no_regression(result)
 
         with allure.step("Проверить сообщение об ошибке"):
-            response_data = response.json()
-            assert "message" in response_data, ("В ответе отсутствует "
-                                                "сообщение об ошибке")
+            scenario.check_body(response.json())
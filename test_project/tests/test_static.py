@@ -0,0 +1,107 @@
+import os
+import pytest
+import allure
+from selenium.webdriver.common.by import By
+from tests.pages import SearchPage, StaticClient
+from tests.pages.locator_check import SNAPSHOTS_DIR, check_registry, format_reports
+
+
+BASE_URL = os.getenv("BASE_URL", "https://www.kinopoisk.ru")
+
+# Эталонная разметка страниц: реестр проверяется и без снимков сайта
+FIXTURE_SNAPSHOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                     "fixtures", "snapshots")
+
+MAIN_SECTIONS = [
+    ("Фильмы", f"{BASE_URL}/lists/categories/movies/1/"),
+    ("Сериалы", f"{BASE_URL}/lists/categories/series/1/"),
+    ("Топ 250", f"{BASE_URL}/lists/movies/top250/"),
+]
+
+
+@allure.epic("Kinopoisk Static Checks")
+@allure.feature("Проверки HTML без браузера")
+class TestKinopoiskStaticPages:
+    """Проверки, которым не нужен JavaScript: HTML разбирается без запуска Chrome"""
+
+    @allure.story("Навигация по разделам")
+    @allure.title("Доступность основных разделов сайта")
+    @pytest.mark.nojs
+    @pytest.mark.smoke
+    def test_sections_available(self, static_client: StaticClient) -> None:
+        """
+        Разделы отвечают и содержат ссылки на фильмы (бывший шаг 1 TC-104)
+
+        Args:
+            static_client: HTTP клиент с пулом соединений
+        """
+        with allure.step("Загрузить разделы параллельно"):
+            pages = static_client.open_all([url for _, url in MAIN_SECTIONS])
+
+        if any(page.is_captcha for page in pages):
+            pytest.skip("❌ Вместо HTML получена капча")
+
+        for (section_name, _), page in zip(MAIN_SECTIONS, pages):
+            with allure.step(f"Проверить раздел '{section_name}'"):
+                assert page.status_code == 200, \
+                    f"Раздел '{section_name}' вернул {page.status_code}"
+                assert page.count((By.TAG_NAME, "body")) == 1, \
+                    f"Раздел '{section_name}' вернул пустую страницу"
+                print(f"✅ Раздел '{section_name}' доступен "
+                      f"({page.elapsed * 1000:.0f} мс, "
+                      f"ссылок на фильмы: {page.count(SearchPage.FILM_LINK)})")
+
+    @allure.story("Списки фильмов")
+    @allure.title("Ссылки на фильмы в топ-250 и жанре")
+    @pytest.mark.nojs
+    @pytest.mark.regression
+    @pytest.mark.parametrize("url", [
+        f"{BASE_URL}/lists/movies/top250/",
+        f"{BASE_URL}/lists/categories/movies/8/",
+    ])
+    def test_film_links_present(self, static_client: StaticClient, url: str) -> None:
+        """
+        На странице списка есть ссылки на фильмы с названиями
+
+        Args:
+            static_client: HTTP клиент с пулом соединений
+            url: Страница списка
+        """
+        page = static_client.open(url)
+        if page.is_captcha:
+            pytest.skip("❌ Вместо HTML получена капча")
+
+        with allure.step("Проверить статус и ссылки на фильмы"):
+            assert page.status_code == 200, f"Страница вернула {page.status_code}"
+            links = page.extract(SearchPage.FILM_LINK, ["text", "href"])
+            assert links, "Ссылки на фильмы не найдены"
+            assert all("/film/" in link["href"] for link in links)
+            print(f"✅ Найдено ссылок на фильмы: {len(links)}")
+
+    @allure.story("Локаторы")
+    @allure.title("Реестр локаторов по сохраненным снимкам страниц")
+    @pytest.mark.nojs
+    @pytest.mark.regression
+    @pytest.mark.parametrize("snapshots_dir", [
+        pytest.param(FIXTURE_SNAPSHOTS_DIR, id="fixtures"),
+        pytest.param(os.getenv("SNAPSHOTS_DIR", SNAPSHOTS_DIR), id="saved"),
+    ])
+    def test_locator_registry(self, snapshots_dir: str) -> None:
+        """
+        Каждый элемент реестра находится хотя бы одним локатором в снимке своей страницы
+
+        Args:
+            snapshots_dir: Эталонные снимки из репозитория (tests/fixtures/snapshots)
+                или снимки сайта, сохраненные UI тестами с --save-snapshots
+        """
+        reports = check_registry(snapshots_dir)
+        if not any(report.snapshot for report in reports):
+            pytest.skip("❌ Нет снимков страниц (запустите UI тесты с --save-snapshots)")
+
+        report_text = format_reports(reports)
+        print(report_text)
+        allure.attach(report_text, name="Проверка локаторов",
+                      attachment_type=allure.attachment_type.TEXT)
+
+        broken = [report.name for report in reports if report.broken]
+        assert not broken, f"Элементы не найдены ни одним локатором: {broken}"
@@ -0,0 +1,5 @@
+# Этот файл делает директорию utils Python пакетом
+from .profiles import clone_profile, worker_profile_dir
+from .timing import StepTimer, get_step_timer
+
+__all__ = ['clone_profile', 'worker_profile_dir', 'StepTimer', 'get_step_timer']
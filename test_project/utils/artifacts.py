@@ -0,0 +1,220 @@
+"""
+Снимок состояния браузера при падении UI теста
+
+В потоке теста снимаются только сырые данные: PNG скриншот, HTML
+страницы и лог консоли. Уменьшение скриншота и сжатие в WebP/JPEG
+(Pillow), gzip исходного кода страницы и запись файлов выполняются
+в фоновом потоке, поэтому упавший тест не ждет кодирования.
+
+Вложение Allure регистрируется сразу, пока тест еще открыт, с пустым
+телом-заглушкой; фоновый поток записывает готовый файл на место
+заглушки в каталоге --alluredir. Без --alluredir файлы сохраняются
+в reports/failures/<тест>/.
+"""
+import gzip
+import io
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+import allure
+import allure_commons
+from selenium.common.exceptions import WebDriverException
+
+try:
+    from PIL import Image
+except ImportError:  # без Pillow скриншот сохраняется исходным PNG
+    Image = None
+
+
+# Формат скриншота -> (формат Pillow, MIME тип, расширение файла)
+IMAGE_FORMATS = {
+    "webp": ("WEBP", "image/webp", "webp"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "png": ("PNG", "image/png", "png"),
+}
+
+
+class _Placeholder(bytes):
+    """Пустое тело вложения: файл на его месте запишет фоновый поток"""
+
+
+def encode_screenshot(png: bytes, image_format: str, max_width: int, quality: int) -> bytes:
+    """Уменьшить скриншот до max_width по ширине и сжать в image_format"""
+    if Image is None:
+        return png
+    image = Image.open(io.BytesIO(png))
+    if image.width > max_width:
+        image.thumbnail((max_width, image.height), Image.LANCZOS)
+    pil_format = IMAGE_FORMATS[image_format][0]
+    if pil_format == "JPEG":
+        image = image.convert("RGB")
+    output = io.BytesIO()
+    if pil_format == "PNG":
+        image.save(output, format=pil_format, optimize=True)
+    else:
+        image.save(output, format=pil_format, quality=quality)
+    return output.getvalue()
+
+
+def format_console_log(entries: List[dict]) -> str:
+    return "\n".join(f"[{entry.get('level')}] {entry.get('message')}" for entry in entries) \
+        or "Лог консоли пуст"
+
+
+class FailureArtifacts:
+    """
+    Вложения упавших UI тестов с фоновым сжатием и бюджетом размера
+
+    Регистрируется плагином allure_commons: хук report_attached_data
+    сообщает имя файла, зарезервированного под заглушку. Когда записано
+    max_bytes, новые снимки не делаются (и не тратят время тестов).
+    """
+
+    def __init__(self, report_dir: Optional[str], fallback_dir: str,
+                 max_bytes: int = 50 * 1024 * 1024, image_format: str = "webp",
+                 max_width: int = 1280, quality: int = 70) -> None:
+        """
+        Args:
+            report_dir: Каталог --alluredir (None - Allure не пишет результаты)
+            fallback_dir: Каталог файлов без Allure
+            max_bytes: Бюджет размера всех вложений за прогон
+            image_format: 'webp', 'jpeg' или 'png'
+            max_width: Максимальная ширина скриншота
+            quality: Качество WebP/JPEG (1-100)
+        """
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Неизвестный формат скриншота: {image_format}")
+        self.report_dir = report_dir
+        self.fallback_dir = fallback_dir
+        self.max_bytes = max_bytes
+        # Без Pillow перекодировать нечем - вложение остается PNG
+        self.image_format = image_format if Image is not None else "png"
+        self.max_width = max_width
+        self.quality = quality
+        self.written_bytes = 0
+        self.saved = 0
+        self.skipped = 0
+        self.capture_seconds = 0.0
+        self.encode_seconds = 0.0
+        self._reserved: Optional[str] = None
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifacts")
+
+    @classmethod
+    def from_env(cls, report_dir: Optional[str], fallback_dir: str) -> "FailureArtifacts":
+        """Настройки из переменных ARTIFACTS_* (.env)"""
+        return cls(report_dir, fallback_dir,
+                   max_bytes=int(float(os.getenv("ARTIFACTS_MAX_MB", 50)) * 1024 * 1024),
+                   image_format=os.getenv("ARTIFACTS_IMAGE_FORMAT", "webp").lower(),
+                   max_width=int(os.getenv("ARTIFACTS_MAX_WIDTH", 1280)),
+                   quality=int(os.getenv("ARTIFACTS_QUALITY", 70)))
+
+    @property
+    def exhausted(self) -> bool:
+        return self.written_bytes >= self.max_bytes
+
+    @allure_commons.hookimpl
+    def report_attached_data(self, body, file_name):
+        if isinstance(body, _Placeholder):
+            self._reserved = file_name
+
+    def _reserve(self, test_name: str, stem: str, name: str, mime_type: str,
+                 extension: str) -> str:
+        """Путь файла вложения: заглушка в Allure или каталог fallback_dir"""
+        if self.report_dir:
+            self._reserved = None
+            allure.attach(_Placeholder(), name=name, attachment_type=mime_type,
+                          extension=extension)
+            if self._reserved:
+                return os.path.join(self.report_dir, self._reserved)
+        directory = os.path.join(self.fallback_dir, re.sub(r"[^\w.-]+", "_", test_name))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{stem}.{extension}")
+
+    def capture(self, driver, test_name: str) -> Optional[float]:
+        """
+        Снять скриншот, HTML и лог консоли и отдать их на сжатие
+
+        Returns:
+            Время работы в потоке теста, секунды; None - бюджет исчерпан
+        """
+        started = time.perf_counter()
+        if self.exhausted:
+            with self._lock:
+                self.skipped += 1
+            return None
+
+        try:
+            png = driver.get_screenshot_as_png()
+        except WebDriverException:
+            png = None
+        try:
+            source = driver.page_source
+        except WebDriverException:
+            source = None
+        try:
+            console = driver.get_log("browser")
+        except WebDriverException:
+            console = None
+
+        if png is not None:
+            _, mime_type, extension = IMAGE_FORMATS[self.image_format]
+            path = self._reserve(test_name, "screenshot", "Скриншот", mime_type, extension)
+            self._submit(path, encode_screenshot, png, self.image_format,
+                         self.max_width, self.quality)
+        if source is not None:
+            path = self._reserve(test_name, "page", "Страница (HTML, gzip)",
+                                 "application/gzip", "html.gz")
+            self._submit(path, lambda text: gzip.compress(text.encode("utf-8")), source)
+        if console is not None:
+            path = self._reserve(test_name, "console", "Консоль браузера",
+                                 "text/plain", "txt")
+            self._submit(path, lambda entries: format_console_log(entries).encode("utf-8"),
+                         console)
+
+        elapsed = time.perf_counter() - started
+        self.capture_seconds += elapsed
+        return elapsed
+
+    def _submit(self, path: str, encode: Callable[..., bytes], *args) -> None:
+        self._futures.append(self._executor.submit(self._write, path, encode, *args))
+
+    def _write(self, path: str, encode: Callable[..., bytes], *args) -> None:
+        started = time.perf_counter()
+        try:
+            data = encode(*args)
+        except Exception as e:
+            print(f"⚠️ Вложение {os.path.basename(path)} не сжато: {e}")
+            return
+        with self._lock:
+            self.encode_seconds += time.perf_counter() - started
+            if self.written_bytes + len(data) > self.max_bytes:
+                # Заглушка остается пустой
+                self.skipped += 1
+                return
+            self.written_bytes += len(data)
+            self.saved += 1
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def wait(self) -> None:
+        """Дождаться записи всех вложений"""
+        for future in self._futures:
+            future.result()
+        self._futures = []
+
+    def close(self) -> None:
+        self.wait()
+        self._executor.shutdown()
+
+    def summary(self) -> str:
+        return (f"сохранено файлов {self.saved} ({self.written_bytes / 1024:.0f} КБ "
+                f"из {self.max_bytes / 1024 / 1024:.0f} МБ), пропущено по бюджету "
+                f"{self.skipped}, в потоке тестов {self.capture_seconds:.2f} с, "
+                f"сжатие в фоне {self.encode_seconds:.2f} с")
@@ -0,0 +1,47 @@
+from typing import Any, Callable, Optional
+from selenium.common.exceptions import WebDriverException
+
+
+class BrowserSession:
+    """
+    Браузер сессии тестов, который можно перезапустить
+
+    Запуск целиком выполняет launch (профиль, опции, слушатели команд),
+    поэтому после restart браузер настроен так же, как при старте сессии,
+    и использует тот же профиль с cookies анти-капчи.
+    """
+
+    def __init__(self, launch: Callable[[], Any]) -> None:
+        """
+        Args:
+            launch: Функция, запускающая и настраивающая WebDriver
+        """
+        self.launch = launch
+        self.driver = None
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Процесс chromedriver (Chrome - его потомки)"""
+        try:
+            return self.driver.service.process.pid
+        except AttributeError:
+            return None
+
+    def start(self) -> Any:
+        self.driver = self.launch()
+        return self.driver
+
+    def quit(self) -> None:
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except WebDriverException:
+            # Упавший браузер может не ответить на quit, процессы завершит service
+            pass
+        self.driver = None
+
+    def restart(self) -> Any:
+        """Закрыть браузер (профиль сохраняется на диск) и запустить заново"""
+        self.quit()
+        return self.start()
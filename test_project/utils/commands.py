@@ -0,0 +1,130 @@
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Слушатель получает имя команды WebDriver, ее параметры и длительность в секундах
+CommandListener = Callable[[str, dict, float], None]
+
+# Поток сейчас выполняет слушателей: их собственные команды (executeScript
+# сборщика метрик, page_source снимков DOM) слушателям не передаются
+_listener_state = threading.local()
+
+
+def add_command_listener(driver, listener: CommandListener) -> None:
+    """
+    Подписаться на все команды WebDriver драйвера
+
+    command_executor.execute оборачивается один раз, дальше слушатели
+    только добавляются в список. Слушатель вызывается после ответа
+    chromedriver, в том числе если команда завершилась ошибкой.
+    Команды, отправленные из самих слушателей, слушателям не передаются.
+    """
+    executor = driver.command_executor
+    listeners = getattr(executor, "_command_listeners", None)
+    if listeners is None:
+        listeners = executor._command_listeners = []
+        original = executor.execute
+
+        def execute(command, params):
+            if getattr(_listener_state, "active", False):
+                return original(command, params)
+            started = time.perf_counter()
+            try:
+                return original(command, params)
+            finally:
+                elapsed = time.perf_counter() - started
+                _listener_state.active = True
+                try:
+                    for callback in list(listeners):
+                        callback(command, params, elapsed)
+                finally:
+                    _listener_state.active = False
+
+        executor.execute = execute
+    listeners.append(listener)
+
+
+def _merge(target: Dict[str, List[float]], source: Dict[str, List[float]]) -> None:
+    for name, (count, seconds) in source.items():
+        entry = target.setdefault(name, [0, 0.0])
+        entry[0] += count
+        entry[1] += seconds
+
+
+class CommandProfiler:
+    """
+    Профилировщик команд WebDriver (--profile-webdriver)
+
+    Считает число и время команд для каждого теста и для каждого места
+    вызова: строки теста в tests/test_*.py и, если команда ушла из page
+    object, строки в pages/, через которую она прошла.
+    """
+
+    def __init__(self, tests_dir: str) -> None:
+        self.tests_dir = os.path.abspath(tests_dir) + os.sep
+        self.root = os.path.dirname(os.path.abspath(tests_dir))
+        self.current_test = ""
+        # тест -> команда -> [количество, секунды]
+        self.tests: Dict[str, Dict[str, List[float]]] = {}
+        # файл:строка -> команда -> [количество, секунды]
+        self.sites: Dict[str, Dict[str, List[float]]] = {}
+
+    def _call_site(self) -> Optional[str]:
+        """'tests/test_ui.py:120 <- tests/pages/base_page.py:300' или одна из строк"""
+        inner = outer = None
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(self.tests_dir):
+                line = f"{os.path.relpath(filename, self.root)}:{frame.f_lineno}"
+                inner = inner or line
+                if os.path.basename(filename).startswith("test_"):
+                    outer = line
+            frame = frame.f_back
+        if outer and inner != outer:
+            return f"{outer} <- {inner}"
+        return outer or inner
+
+    def __call__(self, command: str, params: dict, elapsed: float) -> None:
+        per_test = self.tests.setdefault(self.current_test, {})
+        _merge(per_test, {command: [1, elapsed]})
+        site = self._call_site()
+        if site:
+            _merge(self.sites.setdefault(site, {}), {command: [1, elapsed]})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"tests": self.tests, "sites": self.sites}
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Добавить данные другого процесса (воркера xdist)"""
+        for attr in ("tests", "sites"):
+            own = getattr(self, attr)
+            for name, commands in data.get(attr, {}).items():
+                _merge(own.setdefault(name, {}), commands)
+
+    @staticmethod
+    def _totals(commands: Dict[str, List[float]]) -> tuple:
+        return (sum(count for count, _ in commands.values()),
+                sum(seconds for _, seconds in commands.values()))
+
+    def format(self, top: int = 10) -> List[str]:
+        """Итоги по тестам и самые тяжелые места вызова"""
+        lines = [f"{'команд':>7} {'время, с':>9}  тест (основные команды)"]
+        for test, commands in sorted(self.tests.items()):
+            count, seconds = self._totals(commands)
+            heaviest = sorted(commands.items(), key=lambda item: item[1][1], reverse=True)
+            details = ", ".join(f"{name} x{stat[0]}" for name, stat in heaviest[:3])
+            lines.append(f"{count:>7} {seconds:>9.2f}  {test.split('::')[-1] or '-'} "
+                         f"({details})")
+
+        lines += ["", f"{'команд':>7} {'время, с':>9}  место вызова"]
+        sites = sorted(self.sites.items(), key=lambda item: self._totals(item[1])[1],
+                       reverse=True)
+        for site, commands in sites[:top]:
+            count, seconds = self._totals(commands)
+            names = ", ".join(sorted(commands))
+            lines.append(f"{count:>7} {seconds:>9.2f}  {site} ({names})")
+        return lines
@@ -0,0 +1,201 @@
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+
+# Типичные места установки Chrome/Chromium для каждой ОС
+CHROME_CANDIDATES = {
+    "win32": (
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files\Google\Chrome\chrome-win32\chrome.exe",
+        os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
+    ),
+    "darwin": (
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "/Applications/Google Chrome for Testing.app/Contents/MacOS/"
+        "Google Chrome for Testing",
+        "/Applications/Chromium.app/Contents/MacOS/Chromium",
+    ),
+    "linux": (),
+}
+CHROME_COMMANDS = ("google-chrome", "google-chrome-stable", "chromium",
+                   "chromium-browser", "chrome")
+
+
+def host_platform() -> str:
+    """Ключ ОС: win32, darwin или linux"""
+    if sys.platform.startswith("linux"):
+        return "linux"
+    return sys.platform
+
+
+def find_chrome_binary() -> Optional[str]:
+    """Найти Chrome: CHROME_BINARY, стандартные пути ОС, затем PATH"""
+    configured = os.getenv("CHROME_BINARY")
+    if configured:
+        return configured if os.path.exists(configured) else None
+
+    for path in CHROME_CANDIDATES.get(host_platform(), ()):
+        if os.path.exists(path):
+            return path
+    for command in CHROME_COMMANDS:
+        path = shutil.which(command)
+        if path:
+            return path
+    return None
+
+
+def chrome_version(binary: str) -> Optional[str]:
+    """Полная версия Chrome, например '141.0.7390.54'"""
+    if host_platform() == "win32":
+        command = ["powershell", "-NoProfile", "-Command",
+                   f"(Get-Item '{binary}').VersionInfo.ProductVersion"]
+    else:
+        command = [binary, "--version"]
+    try:
+        output = subprocess.run(command, capture_output=True, text=True,
+                                timeout=15).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"\d+\.\d+\.\d+\.\d+", output)
+    return match.group(0) if match else None
+
+
+class DriverProvisioner:
+    """
+    Поиск Chrome и chromedriver для текущей ОС с кэшированием
+
+    Найденные пути запоминаются в drivers/manifest.json с ключом
+    ОС-архитектура-версия Chrome, поэтому при следующих сессиях
+    драйвер не ищется и не скачивается заново. Если Chrome не найден,
+    Selenium Manager скачивает Chrome for Testing нужного канала.
+    """
+
+    def __init__(self, drivers_dir: str) -> None:
+        self.drivers_dir = drivers_dir
+        self.manifest_path = os.path.join(drivers_dir, "manifest.json")
+
+    def _read_manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, key: str, entry: Dict[str, str]) -> None:
+        manifest = self._read_manifest()
+        manifest[key] = entry
+        os.makedirs(self.drivers_dir, exist_ok=True)
+        # Воркеры xdist пишут манифест одновременно: файл заменяется целиком,
+        # поэтому читатель не увидит недописанный JSON
+        fd, tmp_path = tempfile.mkstemp(dir=self.drivers_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _cached(self, key: str) -> Optional[Dict[str, str]]:
+        entry = self._read_manifest().get(key)
+        if entry and all(os.path.exists(path) for path in entry.values() if path):
+            return entry
+        return None
+
+    def _install_chromedriver(self, version: str) -> str:
+        """Скачать chromedriver под версию Chrome в версионированный кэш"""
+        from webdriver_manager.chrome import ChromeDriverManager
+        from webdriver_manager.core.driver_cache import DriverCacheManager
+
+        cache = DriverCacheManager(root_dir=self.drivers_dir, valid_range=365)
+        return ChromeDriverManager(driver_version=version, cache_manager=cache).install()
+
+    def provision(self, options: Options) -> str:
+        """
+        Подготовить браузер и драйвер
+
+        Args:
+            options: Options Chrome; binary_location выставляется здесь
+
+        Returns:
+            Путь к chromedriver
+        """
+        configured_driver = os.getenv("CHROMEDRIVER_PATH")
+        binary = find_chrome_binary()
+
+        if configured_driver:
+            if binary:
+                options.binary_location = binary
+            return configured_driver
+
+        base_key = f"{host_platform()}-{platform.machine().lower()}"
+        version = chrome_version(binary) if binary else None
+        if binary and version is None:
+            # Версию Chrome узнать не удалось: драйвер под сам браузер подбирает
+            # Selenium Manager, без кэша - ключ манифеста не отследил бы обновление
+            options.binary_location = binary
+            return SeleniumManager().driver_location(options)
+
+        if binary:
+            key = f"{base_key}-chrome-{version}"
+            cached = self._cached(key)
+            if not cached:
+                cached = {"driver": self._install_chromedriver(version), "browser": binary}
+                self._write_manifest(key, cached)
+        else:
+            # Chrome не установлен: скачиваем Chrome for Testing через Selenium Manager
+            channel = os.getenv("CHROME_VERSION", "stable")
+            key = f"{base_key}-cft-{channel}"
+            cached = self._cached(key)
+            if not cached:
+                options.browser_version = channel
+                driver_path = SeleniumManager().driver_location(options)
+                cached = {"driver": driver_path, "browser": options.binary_location}
+                self._write_manifest(key, cached)
+
+        options.binary_location = cached["browser"]
+        options.browser_version = None
+        return cached["driver"]
+
+
+def apply_host_arguments(options: Options) -> None:
+    """Аргументы запуска, зависящие от хоста (headless, контейнеры Linux)"""
+    if os.getenv("HEADLESS", "0").lower() in ("1", "true", "yes"):
+        options.add_argument("--headless=new")
+    if host_platform() == "linux":
+        # В контейнерах /dev/shm обычно 64 МБ, а sandbox недоступен под root
+        options.add_argument("--disable-dev-shm-usage")
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            options.add_argument("--no-sandbox")
+
+
+class StartupTimer:
+    """Замер времени подготовки драйвера и запуска браузера"""
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self._started = None
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """Записать длительность этапа с момента предыдущей отметки"""
+        now = time.perf_counter()
+        self.timings[stage] = now - self._started
+        self._started = now
+
+    def record(self, path: str, **details: str) -> None:
+        """Добавить замер в историю (JSON Lines) для отслеживания холодного старта"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = dict(details, timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+                     platform=host_platform(), **self.timings)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
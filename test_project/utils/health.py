@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Dict, Optional
+import requests
+
+
+# Тот же User Agent, что и у браузера в conftest.py
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36")
+
+
+def is_captcha_url(url: str) -> bool:
+    """Яндекс перенаправляет на капчу по адресу /showcaptcha"""
+    return "showcaptcha" in (url or "")
+
+
+class HealthTarget:
+    """
+    Проверяемый хост и его предохранитель (circuit breaker)
+
+    Предохранитель размыкается после threshold неудачных проверок подряд
+    и замыкается после первой успешной. Размыкание через trip (например,
+    капча в браузере) действует до конца сессии.
+    """
+
+    def __init__(self, name: str, url: str, threshold: int = 2,
+                 method: str = "GET") -> None:
+        self.name = name
+        self.url = url
+        self.threshold = threshold
+        self.method = method
+        self.failures = 0
+        self.reason: Optional[str] = None
+        self.sticky = False
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.reason is not None
+
+    def probe(self, session: requests.Session, timeout: float) -> Optional[str]:
+        """
+        Один запрос к хосту; None - хост доступен, иначе причина
+
+        Капча в ответе requests сбоем не считается: браузер с профилем
+        и cookies анти-капчи ее обычно не получает (см. HealthTarget.trip).
+        """
+        try:
+            response = session.request(self.method, self.url, timeout=timeout,
+                                       allow_redirects=True)
+        except requests.RequestException as e:
+            return f"{self.url} недоступен: {type(e).__name__}"
+        if response.status_code == 429:
+            return f"{self.url} ограничивает частоту запросов (429)"
+        if response.status_code >= 500:
+            return f"{self.url} отвечает {response.status_code}"
+        return None
+
+    def update(self, failure: Optional[str]) -> None:
+        with self.lock:
+            if self.sticky:
+                return
+            if failure is None:
+                self.failures = 0
+                self.reason = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.reason = failure
+
+    def trip(self, reason: str) -> None:
+        """Разомкнуть до конца сессии"""
+        with self.lock:
+            self.reason = reason
+            self.sticky = True
+
+
+class HealthMonitor:
+    """
+    Проверка доступности сайта и API перед тестами и во время прогона
+
+    Хост начинает проверяться при первом тесте, которому он нужен:
+    первая проверка синхронная (с одним повтором), дальше хосты
+    перепроверяются в фоновом потоке каждые interval секунд.
+    """
+
+    def __init__(self, interval: float = 30, timeout: float = 10,
+                 threshold: int = 2) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.threshold = threshold
+        self.targets: Dict[str, HealthTarget] = {}
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def watch(self, name: str, url: str, method: str = "GET") -> HealthTarget:
+        """Начать проверять хост (повторный вызов возвращает тот же объект)"""
+        with self._lock:
+            target = self.targets.get(name)
+            if target:
+                return target
+            target = HealthTarget(name, url, self.threshold, method)
+            for attempt in range(self.threshold):
+                if attempt:
+                    time.sleep(1)
+                failure = target.probe(self.session, self.timeout)
+                target.update(failure)
+                if failure is None:
+                    break
+            self.targets[name] = target
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="health-monitor",
+                                                daemon=True)
+                self._thread.start()
+            return target
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            for target in list(self.targets.values()):
+                target.update(target.probe(self.session, self.timeout))
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.session.close()
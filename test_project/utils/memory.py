@@ -0,0 +1,198 @@
+"""
+Сторож памяти браузера
+
+После каждого UI теста снимается память: JS heap, число DOM узлов и
+документов (CDP Performance.getMetrics) и RSS всех процессов Chrome
+(дерево процессов chromedriver через psutil или /proc). Замеры пишутся
+в reports/browser_memory.jsonl, а прирост heap за тест показывает
+страницы, после которых память не освобождается. При превышении
+порога браузер перезапускается перед следующим тестом.
+"""
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil
+except ImportError:  # без psutil RSS читается из /proc (только Linux)
+    psutil = None
+
+
+# Метрика CDP -> поле замера
+CDP_MEMORY_METRICS = {
+    "JSHeapUsedSize": "heap_mb",
+    "JSHeapTotalSize": "heap_total_mb",
+    "Nodes": "dom_nodes",
+    "Documents": "documents",
+    "JSEventListeners": "listeners",
+}
+
+
+def _proc_tree_rss(pid: int) -> Optional[int]:
+    """RSS дерева процессов из /proc, байты"""
+    children: Dict[int, List[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # Имя процесса в скобках может содержать пробелы
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def process_tree_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """
+    Память процесса и всех его потомков, МБ
+
+    Для chromedriver это браузер, рендереры и GPU процесс Chrome.
+    None - память узнать не удалось.
+    """
+    if pid is None:
+        return None
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / 1024 / 1024
+    if os.path.isdir("/proc"):
+        return _proc_tree_rss(pid) / 1024 / 1024
+    return None
+
+
+class MemoryWatchdog:
+    """
+    Замер памяти браузера после тестов и решение о перезапуске
+
+    Порог 0 отключает соответствующую проверку. Перезапуск запрашивается
+    и тогда, когда браузер не отвечает на CDP (например, упал рендерер).
+    """
+
+    def __init__(self, max_heap_mb: float = 1024, max_rss_mb: float = 3072,
+                 history_path: str = None) -> None:
+        """
+        Args:
+            max_heap_mb: Порог JS heap страницы
+            max_rss_mb: Порог памяти всех процессов Chrome
+            history_path: JSONL файл замеров по тестам
+        """
+        self.max_heap_mb = max_heap_mb
+        self.max_rss_mb = max_rss_mb
+        self.history_path = history_path
+        self.records: List[Dict[str, Any]] = []
+        self.restarts = 0
+        self.restart_reason: Optional[str] = None
+        self._previous_heap: Optional[float] = None
+        self._enabled_for = None
+
+    @classmethod
+    def from_env(cls, history_path: str = None) -> "MemoryWatchdog":
+        """Пороги из MEMORY_MAX_HEAP_MB и MEMORY_MAX_RSS_MB"""
+        return cls(max_heap_mb=float(os.getenv("MEMORY_MAX_HEAP_MB", 1024)),
+                   max_rss_mb=float(os.getenv("MEMORY_MAX_RSS_MB", 3072)),
+                   history_path=history_path)
+
+    def _cdp_metrics(self, driver) -> Dict[str, float]:
+        if self._enabled_for is not driver:
+            driver.execute_cdp_cmd("Performance.enable", {})
+            self._enabled_for = driver
+        raw = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        values = {metric["name"]: metric["value"] for metric in raw}
+        metrics = {key: values[name] for name, key in CDP_MEMORY_METRICS.items()
+                   if name in values}
+        for key in ("heap_mb", "heap_total_mb"):
+            if key in metrics:
+                metrics[key] = round(metrics[key] / 1024 / 1024, 1)
+        return metrics
+
+    def sample(self, driver, test: str, pid: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Снять память браузера после теста
+
+        Args:
+            driver: WebDriver
+            test: nodeid теста
+            pid: Процесс chromedriver (для RSS дерева процессов Chrome)
+
+        Returns:
+            Замер; если нужен перезапуск, причина - в restart_reason
+        """
+        record: Dict[str, Any] = {"test": test,
+                                  "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
+        try:
+            record["url"] = driver.current_url
+            record.update(self._cdp_metrics(driver))
+        except WebDriverException as e:
+            self.restart_reason = f"браузер не отвечает: {str(e).splitlines()[0][:80]}"
+        rss = process_tree_rss_mb(pid)
+        if rss is not None:
+            record["rss_mb"] = round(rss, 1)
+
+        heap = record.get("heap_mb")
+        if heap is not None and self._previous_heap is not None:
+            record["heap_growth_mb"] = round(heap - self._previous_heap, 1)
+        if heap is not None:
+            self._previous_heap = heap
+
+        if self.restart_reason is None:
+            if self.max_heap_mb and heap is not None and heap > self.max_heap_mb:
+                self.restart_reason = f"JS heap {heap:.0f} МБ больше {self.max_heap_mb:.0f} МБ"
+            elif self.max_rss_mb and rss is not None and rss > self.max_rss_mb:
+                self.restart_reason = (f"память процессов Chrome {rss:.0f} МБ "
+                                       f"больше {self.max_rss_mb:.0f} МБ")
+        record["restart"] = self.restart_reason
+
+        self.records.append(record)
+        if self.history_path:
+            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return record
+
+    def restarted(self) -> None:
+        """Браузер перезапущен: прирост считается заново"""
+        self.restarts += 1
+        self.restart_reason = None
+        self._previous_heap = None
+        self._enabled_for = None
+
+    def leaks(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Тесты с наибольшим приростом JS heap"""
+        grown = [record for record in self.records if record.get("heap_growth_mb", 0) > 0]
+        return sorted(grown, key=lambda record: -record["heap_growth_mb"])[:limit]
+
+    def format(self, limit: int = 5) -> List[str]:
+        peak_heap = max((record.get("heap_mb", 0) for record in self.records), default=0)
+        peak_rss = max((record.get("rss_mb", 0) for record in self.records), default=0)
+        lines = [f"Замеров: {len(self.records)}, перезапусков браузера: {self.restarts}, "
+                 f"пик JS heap {peak_heap:.0f} МБ, пик памяти Chrome {peak_rss:.0f} МБ"]
+        for record in self.leaks(limit):
+            lines.append(f"  +{record['heap_growth_mb']:.1f} МБ heap  {record['test']}  "
+                         f"({record.get('url', '')})")
+        return lines
@@ -0,0 +1,101 @@
+import json
+import os
+from typing import Dict, List
+
+
+# Реклама и счетчики, которые не нужны ни одному UI тесту
+AD_TRACKER_PATTERNS = (
+    "*mc.yandex.ru*", "*an.yandex.ru*", "*yandex.ru/ads*", "*ads.adfox.ru*",
+    "*yastatic.net/pcode*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*doubleclick.net*", "*top-fwz1.mail.ru*", "*vk.com/rtrg*",
+)
+IMAGE_PATTERNS = ("*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*",
+                  "*.svg*", "*avatars.mds.yandex.net*")
+FONT_PATTERNS = ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*")
+MEDIA_PATTERNS = ("*.mp4*", "*.webm*", "*.m3u8*", "*strm.yandex.ru*")
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+def _flag(name: str, default: str = "0") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+class ResourcePolicy:
+    """
+    Политика загрузки ресурсов для UI сессии
+
+    Блокирует запросы по шаблонам URL через CDP Network.setBlockedURLs
+    и задает стратегию загрузки страницы (по умолчанию eager - не ждать
+    картинки, шрифты и рекламу после DOMContentLoaded).
+    """
+
+    def __init__(self, blocked_urls: List[str] = (), block_ads: bool = True,
+                 block_images: bool = False, block_fonts: bool = False,
+                 block_media: bool = False, page_load_strategy: str = "eager") -> None:
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия загрузки: {page_load_strategy}")
+        self.patterns = list(blocked_urls)
+        if block_ads:
+            self.patterns.extend(AD_TRACKER_PATTERNS)
+        if block_images:
+            self.patterns.extend(IMAGE_PATTERNS)
+        if block_fonts:
+            self.patterns.extend(FONT_PATTERNS)
+        if block_media:
+            self.patterns.extend(MEDIA_PATTERNS)
+        self.block_images = block_images
+        self.page_load_strategy = page_load_strategy
+
+    @classmethod
+    def from_env(cls) -> "ResourcePolicy":
+        """Политика из переменных окружения (.env)"""
+        extra = [pattern.strip() for pattern in os.getenv("BLOCK_URLS", "").split(",")
+                 if pattern.strip()]
+        return cls(
+            blocked_urls=extra,
+            block_ads=_flag("BLOCK_ADS", "1"),
+            block_images=_flag("BLOCK_IMAGES"),
+            block_fonts=_flag("BLOCK_FONTS"),
+            block_media=_flag("BLOCK_MEDIA"),
+            page_load_strategy=os.getenv("PAGE_LOAD_STRATEGY", "eager"),
+        )
+
+    def apply_options(self, options) -> None:
+        """Настроить Options до запуска браузера"""
+        options.page_load_strategy = self.page_load_strategy
+        # Лог производительности нужен для подсчета заблокированных запросов,
+        # лог консоли - для вложений упавших тестов (utils.artifacts)
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+
+    def apply(self, driver) -> None:
+        """Включить блокировку в запущенном браузере"""
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+
+
+def network_stats(driver) -> Dict[str, int]:
+    """
+    Забрать накопленный лог производительности и посчитать запросы
+
+    Для заблокированных запросов браузер не знает размер ответа, поэтому
+    считается их количество, а байты - только реально переданные.
+
+    Returns:
+        requests - всего запросов, blocked - заблокировано политикой,
+        failed - прочие ошибки загрузки, transferred_bytes - передано байт
+    """
+    stats = {"requests": 0, "blocked": 0, "failed": 0, "transferred_bytes": 0}
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+        elif method == "Network.loadingFinished":
+            stats["transferred_bytes"] += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason"):
+                stats["blocked"] += 1
+            else:
+                stats["failed"] += 1
+    return stats
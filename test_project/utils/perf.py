@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+import allure
+from selenium.common.exceptions import WebDriverException
+
+
+# Navigation Timing, paint, LCP, CLS и объем ресурсов из Performance API.
+# LCP и CLS доступны только через PerformanceObserver с buffered: true
+PAGE_METRICS_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var result = {lcp: null, cls: 0};
+var nav = performance.getEntriesByType('navigation')[0];
+if (nav) {
+    result.ttfb = nav.responseStart;
+    result.dom_content_loaded = nav.domContentLoadedEventEnd;
+    result.load = nav.loadEventEnd || null;
+}
+performance.getEntriesByType('paint').forEach(function (entry) {
+    if (entry.name === 'first-paint') result.first_paint = entry.startTime;
+    if (entry.name === 'first-contentful-paint') result.fcp = entry.startTime;
+});
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? nav.transferSize : 0;
+resources.forEach(function (entry) { bytes += entry.transferSize || 0; });
+result.transfer_kb = bytes / 1024;
+result.requests = resources.length + (nav ? 1 : 0);
+
+function observe(type, callback) {
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(callback);
+        }).observe({type: type, buffered: true});
+    } catch (e) {}
+}
+observe('largest-contentful-paint', function (entry) { result.lcp = entry.startTime; });
+observe('layout-shift', function (entry) {
+    if (!entry.hadRecentInput) result.cls += entry.value;
+});
+// Буферизованные записи наблюдателей приходят отдельной задачей
+setTimeout(function () { done(result); }, 50);
+"""
+
+# Метрики CDP Performance.getMetrics, которые попадают в отчет
+CDP_METRICS = {"Nodes": "dom_nodes", "JSHeapUsedSize": "js_heap_mb",
+               "LayoutCount": "layouts", "ScriptDuration": "script_ms"}
+
+
+class PerfBudgets:
+    """
+    Бюджеты производительности страниц
+
+    Файл JSON: "default" - бюджеты для всех страниц, "pages" - список
+    {"pattern": регулярное выражение по URL, метрика: предел}. Подходящие
+    записи применяются по порядку поверх default.
+    """
+
+    def __init__(self, default: Dict[str, float] = None,
+                 pages: List[Dict[str, Any]] = ()) -> None:
+        self.default = dict(default or {})
+        self.pages = list(pages)
+
+    @classmethod
+    def load(cls, path: str) -> "PerfBudgets":
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("default"), data.get("pages", []))
+
+    def budget_for(self, url: str) -> Dict[str, float]:
+        budget = dict(self.default)
+        for page in self.pages:
+            if re.search(page["pattern"], url):
+                budget.update({name: value for name, value in page.items()
+                               if name != "pattern"})
+        return budget
+
+    def check(self, url: str, metrics: Dict[str, Optional[float]]) -> List[str]:
+        """Список нарушений бюджета страницы"""
+        violations = []
+        for name, limit in self.budget_for(url).items():
+            value = metrics.get(name)
+            if value is not None and value > limit:
+                violations.append(f"{url}: {name}={value:g} больше бюджета {limit:g}")
+        return violations
+
+
+class PageMetricsCollector:
+    """
+    Сбор метрик производительности после каждого driver.get
+
+    Подключается слушателем команд WebDriver (utils.commands), поэтому
+    работает для всех переходов в тестах и page objects без их изменения.
+    """
+
+    def __init__(self, driver, budgets: PerfBudgets, history_path: str = None) -> None:
+        self.driver = driver
+        self.budgets = budgets
+        self.history_path = history_path
+        self.violations: List[str] = []
+        self.current_test = ""
+        driver.execute_cdp_cmd("Performance.enable", {})
+
+    def __call__(self, command: str, params: dict, elapsed: float) -> None:
+        url = (params or {}).get("url", "")
+        if command != "get" or not url.startswith("http"):
+            return
+        try:
+            self.collect(url, elapsed)
+        except WebDriverException as e:
+            # Страница не загрузилась - метрики снимать не с чего
+            print(f"⚠️ Метрики страницы {url} не собраны: {str(e)[:80]}")
+
+    def _cdp_metrics(self) -> Dict[str, float]:
+        raw = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        values = {metric["name"]: metric["value"] for metric in raw}
+        metrics = {key: values[name] for name, key in CDP_METRICS.items() if name in values}
+        if "js_heap_mb" in metrics:
+            metrics["js_heap_mb"] = metrics["js_heap_mb"] / 1024 / 1024
+        if "script_ms" in metrics:
+            metrics["script_ms"] = metrics["script_ms"] * 1000
+        return metrics
+
+    def collect(self, url: str, get_seconds: float = None) -> Dict[str, Any]:
+        """Снять метрики открытой страницы, проверить бюджет и приложить к Allure"""
+        metrics = self.driver.execute_async_script(PAGE_METRICS_SCRIPT)
+        metrics.update(self._cdp_metrics())
+        if get_seconds is not None:
+            metrics["get_ms"] = get_seconds * 1000
+        metrics = {name: round(value, 3) if isinstance(value, float) else value
+                   for name, value in metrics.items()}
+
+        violations = self.budgets.check(url, metrics)
+        self.violations.extend(violations)
+
+        print(f"⏱️ {url}: TTFB {metrics.get('ttfb') or 0:.0f} мс, "
+              f"FCP {metrics.get('fcp') or 0:.0f} мс, LCP {metrics.get('lcp') or 0:.0f} мс, "
+              f"CLS {metrics.get('cls') or 0:.3f}, {metrics.get('transfer_kb') or 0:.0f} КБ, "
+              f"запросов {metrics.get('requests')}")
+        for violation in violations:
+            print(f"❌ Бюджет превышен: {violation}")
+
+        report = {"url": url, "metrics": metrics, "budget": self.budgets.budget_for(url),
+                  "violations": violations}
+        allure.attach(json.dumps(report, ensure_ascii=False, indent=2),
+                      name=f"Метрики страницы {url}",
+                      attachment_type=allure.attachment_type.JSON)
+        if self.history_path:
+            os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+            with open(self.history_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(dict(report, test=self.current_test,
+                                        timestamp=time.strftime("%Y-%m-%d %H:%M:%S")),
+                                   ensure_ascii=False) + "\n")
+        return metrics
@@ -0,0 +1,82 @@
+import os
+import shutil
+import subprocess
+import sys
+
+
+# Файлы блокировки Chrome: с ними клон профиля нельзя открыть вторым браузером
+PROFILE_LOCK_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket",
+                      "lockfile")
+# Кэши не влияют на состояние "без капчи", их копирование только тратит время
+PROFILE_CACHE_DIRS = ("Cache", "Code Cache", "GPUCache", "ShaderCache",
+                      "GrShaderCache", "DawnCache", "Crashpad")
+
+
+def _copy_on_write(source: str, target: str) -> bool:
+    """Клонировать каталог средствами ОС (reflink на Linux, clonefile на macOS)"""
+    if sys.platform.startswith("linux"):
+        command = ["cp", "-a", "--reflink=auto", source, target]
+    elif sys.platform == "darwin":
+        command = ["cp", "-c", "-R", source, target]
+    else:
+        return False
+
+    if not shutil.which("cp"):
+        return False
+    result = subprocess.run(command, capture_output=True)
+    if result.returncode != 0:
+        shutil.rmtree(target, ignore_errors=True)
+        return False
+    return True
+
+
+def _remove_locks(profile_dir: str) -> None:
+    """Удалить файлы блокировки, скопированные из исходного профиля"""
+    for root, _, files in os.walk(profile_dir):
+        for name in files:
+            if name in PROFILE_LOCK_FILES:
+                os.remove(os.path.join(root, name))
+
+
+def clone_profile(source: str, target: str) -> str:
+    """
+    Создать copy-on-write клон прогретого профиля Chrome
+
+    Args:
+        source: Исходный профиль (chrome_test_profile)
+        target: Каталог клона; пересоздается при каждом вызове
+
+    Returns:
+        Путь к клону
+    """
+    shutil.rmtree(target, ignore_errors=True)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    if not os.path.isdir(source):
+        os.makedirs(target)
+        return target
+
+    if not _copy_on_write(source, target):
+        shutil.copytree(source, target, symlinks=True,
+                        ignore=shutil.ignore_patterns(
+                            *PROFILE_LOCK_FILES, *PROFILE_CACHE_DIRS))
+    _remove_locks(target)
+    return target
+
+
+def worker_profile_dir(project_root: str) -> str:
+    """
+    Каталог профиля Chrome для текущего процесса pytest
+
+    Без pytest-xdist используется общий chrome_test_profile. Каждый
+    воркер xdist получает собственный клон, чтобы браузеры не
+    конфликтовали из-за блокировки профиля.
+    """
+    source = os.path.join(project_root, "chrome_test_profile")
+    worker_id = os.getenv("PYTEST_XDIST_WORKER")
+    if not worker_id:
+        return source
+
+    target = os.path.join(project_root, "chrome_profiles", worker_id)
+    print(f"🧬 Клонирование профиля Chrome для воркера {worker_id}...")
+    return clone_profile(source, target)
@@ -0,0 +1,82 @@
+import os
+import time
+from typing import Dict, List
+from urllib.parse import urlparse
+
+
+# Cookies Яндекса, с которыми капча "Я не робот" не показывается повторно
+DEFAULT_KEEP_COOKIES = ("spravka", "_yasc", "yandexuid", "i", "yp")
+
+# Все хранилища origin, кроме cookies (их удаляем выборочно)
+STORAGE_TYPES = ("local_storage,session_storage,indexeddb,websql,"
+                 "cache_storage,service_workers,file_systems")
+
+
+def _origin(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class BrowserReset:
+    """
+    Быстрый сброс состояния браузера между тестами без перезапуска Chrome
+
+    Закрывает лишние окна, уходит на about:blank, очищает хранилища
+    origin сайта через CDP Storage.clearDataForOrigin и удаляет cookies,
+    кроме разрешенных (анти-капча).
+    """
+
+    def __init__(self, origins: List[str], keep_cookies=DEFAULT_KEEP_COOKIES) -> None:
+        self.origins = [_origin(url) for url in origins if url]
+        self.keep_cookies = set(keep_cookies)
+        self.durations: List[float] = []
+
+    @classmethod
+    def from_env(cls) -> "BrowserReset":
+        """Origins из BASE_URL и RESET_ORIGINS, cookies из RESET_KEEP_COOKIES"""
+        origins = [os.getenv("BASE_URL", "https://www.kinopoisk.ru")]
+        origins += [url.strip() for url in os.getenv("RESET_ORIGINS", "").split(",")
+                    if url.strip()]
+        keep = os.getenv("RESET_KEEP_COOKIES")
+        keep_cookies = ([name.strip() for name in keep.split(",") if name.strip()]
+                        if keep is not None else DEFAULT_KEEP_COOKIES)
+        return cls(origins, keep_cookies)
+
+    def _close_extra_windows(self, driver) -> None:
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+    def _delete_cookies(self, driver) -> int:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        deleted = 0
+        for cookie in cookies:
+            if cookie["name"] in self.keep_cookies:
+                continue
+            driver.execute_cdp_cmd("Network.deleteCookies", {
+                "name": cookie["name"], "domain": cookie["domain"],
+                "path": cookie["path"]})
+            deleted += 1
+        return deleted
+
+    def __call__(self, driver) -> Dict[str, float]:
+        """
+        Сбросить состояние
+
+        Returns:
+            seconds - длительность сброса, cookies_deleted - удалено cookies
+        """
+        started = time.perf_counter()
+        self._close_extra_windows(driver)
+        # Сначала уходим со страницы, чтобы ее скрипты не записали хранилище заново
+        driver.get("about:blank")
+        for origin in self.origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": origin, "storageTypes": STORAGE_TYPES})
+        deleted = self._delete_cookies(driver)
+
+        seconds = time.perf_counter() - started
+        self.durations.append(seconds)
+        return {"seconds": seconds, "cookies_deleted": deleted}
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+from statistics import median
+from typing import Dict, List, Sequence, Tuple
+
+
+# Вес нового замера в скользящем среднем длительности теста
+HISTORY_WEIGHT = 0.5
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Разобрать '--shard=i/n' (i от 1 до n)
+
+    Returns:
+        (индекс шарда с 0, число шардов)
+    """
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Шард задается как i/n, получено: {value}")
+    if not 1 <= index <= total:
+        raise ValueError(f"Номер шарда должен быть от 1 до {total}, получено: {index}")
+    return index - 1, total
+
+
+class DurationHistory:
+    """
+    История длительности тестов
+
+    Для каждого теста хранится скользящее среднее длительности
+    (setup + call + teardown) и число прогонов. Тесты без истории
+    получают медиану известных длительностей.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.durations: Dict[str, Dict[str, float]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def estimate(self, nodeid: str) -> float:
+        """Ожидаемая длительность теста в секундах"""
+        entry = self.durations.get(nodeid)
+        if entry:
+            return entry["duration"]
+        known = [entry["duration"] for entry in self.durations.values()]
+        return median(known) if known else 1.0
+
+    def merge(self, other: "DurationHistory") -> None:
+        """
+        Влить историю другого шарда
+
+        Каждый шард обновляет записи только своих тестов, поэтому из двух
+        записей теста берется та, у которой больше прогонов.
+        """
+        for nodeid, entry in other.durations.items():
+            own = self.durations.get(nodeid)
+            if own is None or entry["runs"] > own["runs"]:
+                self.durations[nodeid] = dict(entry)
+
+    def record(self, nodeid: str, seconds: float) -> None:
+        entry = self.durations.get(nodeid)
+        if entry:
+            entry["duration"] += HISTORY_WEIGHT * (seconds - entry["duration"])
+            entry["runs"] += 1
+        else:
+            self.durations[nodeid] = {"duration": seconds, "runs": 1}
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({nodeid: {"duration": round(entry["duration"], 3),
+                                "runs": entry["runs"]}
+                       for nodeid, entry in sorted(self.durations.items())},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class DurationRecorder:
+    """Плагин pytest: суммирует длительность фаз тестов и сохраняет историю"""
+
+    def __init__(self, history: DurationHistory) -> None:
+        self.history = history
+        self.runs: Dict[str, float] = {}
+        self.skipped = set()
+
+    def pytest_runtest_logreport(self, report) -> None:
+        self.runs[report.nodeid] = self.runs.get(report.nodeid, 0.0) + report.duration
+        if report.skipped:
+            self.skipped.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session) -> None:
+        # Пропущенные тесты не показывают реальную длительность
+        recorded = {nodeid: seconds for nodeid, seconds in self.runs.items()
+                    if nodeid not in self.skipped}
+        if not recorded:
+            return
+        for nodeid, seconds in recorded.items():
+            self.history.record(nodeid, seconds)
+        self.history.save()
+
+
+def balance_shards(durations: Dict[str, float], total: int) -> List[List[str]]:
+    """
+    Разбить тесты на шарды жадным LPT: самый долгий тест - в наименее загруженный шард
+
+    Порядок детерминирован (при равной длительности - по имени теста, при равной
+    загрузке - шард с меньшим номером), поэтому все раннеры получают одно разбиение.
+    """
+    shards: List[List[str]] = [[] for _ in range(total)]
+    loads = [0.0] * total
+    for nodeid in sorted(durations, key=lambda nodeid: (-durations[nodeid], nodeid)):
+        target = min(range(total), key=lambda index: (loads[index], index))
+        shards[target].append(nodeid)
+        loads[target] += durations[nodeid]
+    return shards
+
+
+def split_by_name(nodeids: Sequence[str], total: int) -> List[List[str]]:
+    """Разбиение без истории: отсортированные тесты по очереди раздаются шардам"""
+    ordered = sorted(nodeids)
+    return [ordered[index::total] for index in range(total)]
+
+
+def longest_first(nodeids: Sequence[str], durations: Dict[str, float]) -> List[str]:
+    """Порядок запуска от самых долгих тестов к коротким"""
+    return sorted(nodeids, key=lambda nodeid: (-durations[nodeid], nodeid))
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Слияние историй длительности тестов из разных шардов")
+    parser.add_argument("sources", nargs="+", help="Файлы истории шардов")
+    parser.add_argument("--output", required=True, help="Файл общей истории")
+    args = parser.parse_args(argv)
+
+    merged = DurationHistory(args.output)
+    for source in args.sources:
+        merged.merge(DurationHistory(source))
+    merged.save()
+    print(f"💾 История длительности: {len(merged.durations)} тестов -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import os
+import re
+import tempfile
+from typing import Dict, Optional
+from selenium.common.exceptions import WebDriverException
+
+
+class SnapshotRecorder:
+    """
+    Сохранение снимков DOM посещенных страниц (--save-snapshots)
+
+    Подключается слушателем команд WebDriver (utils.commands): после
+    каждого driver.get страница, адрес которой подходит под шаблон из
+    pages, сохраняется в <directory>/<страница>.html. Снимок по текущему
+    адресу можно обновить и вручную (save) - например, в конце теста,
+    когда JavaScript уже дорисовал результаты. Снимки нужны валидатору
+    локаторов: python -m tests.pages.locator_check
+    """
+
+    def __init__(self, driver, directory: str, pages: Dict[str, str]) -> None:
+        """
+        Args:
+            driver: WebDriver
+            directory: Каталог снимков
+            pages: Имя страницы -> регулярное выражение URL
+        """
+        self.driver = driver
+        self.directory = directory
+        self.pages = {name: re.compile(pattern) for name, pattern in pages.items()}
+        self.saved: Dict[str, str] = {}
+
+    def page_for(self, url: str) -> Optional[str]:
+        for name, pattern in self.pages.items():
+            if pattern.search(url):
+                return name
+        return None
+
+    def __call__(self, command: str, params: dict, elapsed: float) -> None:
+        url = (params or {}).get("url", "")
+        if command == "get" and url.startswith("http"):
+            self.save()
+
+    def save(self) -> Optional[str]:
+        """Сохранить снимок текущей страницы; None - страница не из списка"""
+        try:
+            url = self.driver.current_url
+            name = self.page_for(url)
+            if name is None:
+                return None
+            source = self.driver.page_source
+        except WebDriverException as e:
+            print(f"⚠️ Снимок страницы не сохранен: {str(e)[:80]}")
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}.html")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            # Адрес страницы в первой строке нужен валидатору для отчета
+            f.write(f"<!-- {url} -->\n{source}")
+        os.replace(tmp_path, path)
+        self.saved[name] = url
+        return path
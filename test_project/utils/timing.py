@@ -0,0 +1,113 @@
+import csv
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import allure_commons
+
+
+CSV_FIELDS = ("test", "step", "depth", "status", "duration", "wait", "action")
+
+
+class StepTimer:
+    """
+    Замер времени шагов Allure
+
+    Подключается к allure_commons как плагин (хуки start_step/stop_step),
+    поэтому видит и шаги тестов (`with allure.step`), и методы page objects
+    (`@allure.step`). Для каждого шага считается общее время и время
+    ожидания элементов (record_wait из BasePage); остальное - действия.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[Dict[str, Any]] = []
+        self.current_test = ""
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Dict[str, Any]]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        stack = self._stack()
+        stack.append({"uuid": uuid, "step": title, "depth": len(stack),
+                      "started": time.perf_counter(), "wait": 0.0})
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        stack = self._stack()
+        if not stack or stack[-1]["uuid"] != uuid:
+            return
+        step = stack.pop()
+        duration = time.perf_counter() - step["started"]
+        record = {
+            "test": self.current_test,
+            "step": step["step"],
+            "depth": step["depth"],
+            "status": "failed" if exc_type else "passed",
+            "duration": round(duration, 4),
+            "wait": round(step["wait"], 4),
+            "action": round(max(duration - step["wait"], 0.0), 4),
+        }
+        with self._lock:
+            self.records.append(record)
+
+    def add_wait(self, seconds: float) -> None:
+        """Учесть ожидание во всех открытых шагах текущего потока"""
+        for step in self._stack():
+            step["wait"] += seconds
+
+    def slowest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return sorted(self.records, key=lambda record: record["duration"],
+                      reverse=True)[:limit]
+
+    def save(self, directory: str) -> Optional[str]:
+        """
+        Сохранить замеры в step_timings.json и step_timings.csv
+
+        Returns:
+            Путь к JSON файлу или None, если шагов не было
+        """
+        if not self.records:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, "step_timings.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2)
+        with open(os.path.join(directory, "step_timings.csv"), "w",
+                  encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.records)
+        return json_path
+
+
+def format_slowest(records: List[Dict[str, Any]]) -> List[str]:
+    """Строки таблицы самых медленных шагов для консоли"""
+    lines = [f"{'всего, с':>9} {'ожид., с':>9} {'действ., с':>10}  тест / шаг"]
+    for record in records:
+        test = record["test"].split("::")[-1]
+        lines.append(f"{record['duration']:>9.3f} {record['wait']:>9.3f} "
+                     f"{record['action']:>10.3f}  {test} / {record['step']}")
+    return lines
+
+
+_timer = None
+
+
+def get_step_timer() -> StepTimer:
+    """Общий замер шагов для текущего процесса"""
+    global _timer
+    if _timer is None:
+        _timer = StepTimer()
+    return _timer
+
+
+def record_wait(seconds: float) -> None:
+    """Сообщить, сколько шаг ждал появления элемента"""
+    if _timer is not None:
+        _timer.add_wait(seconds)